@@ -1,6 +1,22 @@
 from django.contrib import admin
 from .models import Ingredient, InventoryTransaction
+from .ledger import StockLedger
 # Register your models here.
 
-admin.site.register(Ingredient)
-admin.site.register(InventoryTransaction)
\ No newline at end of file
+@admin.register(Ingredient)
+class IngredientAdmin(admin.ModelAdmin):
+    def get_readonly_fields(self, request, obj=None):
+        # Existing stock is only changed through InventoryTransactions (the ledger)
+        if obj is not None:
+            return ("current_stock",)
+        return ()
+
+
+@admin.register(InventoryTransaction)
+class InventoryTransactionAdmin(admin.ModelAdmin):
+    def save_model(self, request, obj, form, change):
+        # Stock is only changed through the ledger
+        if change:
+            StockLedger().revise(obj, form.initial["transaction_type"], form.initial["quantity"])
+        else:
+            StockLedger().record(obj)
@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from dishto.GlobalUtils import generate_unique_hash
+from .models import Ingredient, InventoryTransaction
+
+
+class InsufficientStockError(ValueError):
+    def __init__(self, ingredient_id: int, quantity: Decimal):
+        self.ingredient_id = ingredient_id
+        self.quantity = quantity
+        name = Ingredient.objects.filter(pk=ingredient_id).values_list("name", flat=True).first()
+        super().__init__(f"Insufficient stock for ingredient '{name}', tried to reduce by {quantity}.")
+
+
+class StockLedger:
+    """
+    The only place that changes `Ingredient.current_stock`.
+
+    Every movement is a single UPDATE evaluated by Postgres (`current_stock + q`,
+    `current_stock - q` guarded by `current_stock >= q`, or `= q`), so concurrent
+    terminals never lose each other's updates and no row is read first. The
+    `ingredient_current_stock_non_negative` constraint backs the guard up.
+    When several ingredients change in one transaction they are updated in id
+    order, so two orders sharing ingredients cannot deadlock.
+
+    Transaction types:
+    - purchase: adds `quantity`.
+    - usage / wastage: removes `quantity`, failing with InsufficientStockError.
+    - adjustment: sets the stock to `quantity` (an inventory count).
+    """
+
+    def apply(self, ingredient_id: int, transaction_type: str, quantity, now=None) -> None:
+        qty = quantity if isinstance(quantity, Decimal) else Decimal(str(quantity))
+        now = now or timezone.now()
+        ingredients = Ingredient.objects.filter(pk=ingredient_id)
+        if transaction_type == 'purchase':
+            ingredients.update(current_stock=F("current_stock") + qty, updated_at=now)
+        elif transaction_type in ['usage', 'wastage']:
+            if not ingredients.filter(current_stock__gte=qty).update(current_stock=F("current_stock") - qty, updated_at=now):
+                raise InsufficientStockError(ingredient_id, qty)
+        elif transaction_type == 'adjustment':
+            if qty < 0:
+                raise ValueError(f"Stock cannot be set to negative value: {qty}")
+            ingredients.update(current_stock=qty, updated_at=now)
+        else:
+            raise ValueError(f"Unknown transaction type '{transaction_type}'.")
+
+    def revert(self, ingredient_id: int, transaction_type: str, quantity, now=None) -> None:
+        """
+        Undoes a purchase, usage or wastage. Adjustments overwrite the stock
+        and cannot be undone, so reverting one is a no-op.
+        """
+        if transaction_type == 'purchase':
+            self.apply(ingredient_id, 'usage', quantity, now)
+        elif transaction_type in ['usage', 'wastage']:
+            self.apply(ingredient_id, 'purchase', quantity, now)
+
+    def record(self, inventory_transaction: InventoryTransaction) -> InventoryTransaction:
+        """
+        Saves a new transaction and applies it to the ingredient's stock atomically.
+        """
+        with transaction.atomic():
+            inventory_transaction.save()
+            self.apply(inventory_transaction.ingredient_id, inventory_transaction.transaction_type, inventory_transaction.quantity)
+        return inventory_transaction
+
+    def revise(self, inventory_transaction: InventoryTransaction, previous_type: str, previous_quantity) -> InventoryTransaction:
+        """
+        Saves an edited transaction, replacing the stock effect of its previous
+        type/quantity with the new one.
+        """
+        with transaction.atomic():
+            inventory_transaction.save()
+            if previous_type != inventory_transaction.transaction_type or Decimal(str(previous_quantity)) != Decimal(str(inventory_transaction.quantity)):
+                now = timezone.now()
+                self.revert(inventory_transaction.ingredient_id, previous_type, previous_quantity, now)
+                self.apply(inventory_transaction.ingredient_id, inventory_transaction.transaction_type, inventory_transaction.quantity, now)
+        return inventory_transaction
+
+    def record_usage(self, outlet, usage: dict, note: str) -> list[InventoryTransaction]:
+        """
+        Records one usage transaction per ingredient in `usage` ({ingredient_id: quantity})
+        with a single insert, then deducts each ingredient's stock.
+        Must be called inside `transaction.atomic()`; on InsufficientStockError
+        the caller's transaction rolls everything back.
+        """
+        usage = sorted(usage.items())
+        if not usage:
+            return []
+        transactions = InventoryTransaction.objects.bulk_create([
+            InventoryTransaction(
+                ingredient_id=ingredient_id,
+                transaction_type='usage',
+                quantity=quantity,
+                note=note,
+                outlet=outlet,
+                slug=generate_unique_hash(),
+            )
+            for ingredient_id, quantity in usage
+        ])
+        now = timezone.now()
+        for ingredient_id, quantity in usage:
+            self.apply(ingredient_id, 'usage', quantity, now)
+        return transactions
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+def clamp_negative_stock(apps, schema_editor):
+    # The old order path could subtract stock twice; bring such rows back to zero
+    # so the constraint can be added.
+    Ingredient = apps.get_model('Inventory', 'Ingredient')
+    Ingredient.objects.filter(current_stock__lt=0).update(current_stock=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(clamp_negative_stock, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ingredient',
+            constraint=models.CheckConstraint(condition=models.Q(('current_stock__gte', 0)), name='ingredient_current_stock_non_negative'),
+        ),
+    ]
@@ -2,9 +2,6 @@ from django.db import models
 from core.models import TimeStampedModel
 from Menu.models import MenuItem
 from dishto.GlobalUtils import generate_unique_hash
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from decimal import Decimal
 
 # Create your models here.
 
@@ -31,6 +28,10 @@ class Ingredient(TimeStampedModel):
 
     class Meta:
         unique_together = ("name", "outlet")
+        constraints = [
+            # Stock changes go through Inventory.ledger.StockLedger, which never goes below zero.
+            models.CheckConstraint(condition=models.Q(current_stock__gte=0), name="ingredient_current_stock_non_negative"),
+        ]
         
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -87,20 +88,3 @@ class InventoryTransaction(TimeStampedModel):
 
     def __str__(self):
         return f"{self.transaction_type} - {self.ingredient.name} ({self.quantity})"
-
-@receiver(post_save, sender=InventoryTransaction)
-def update_ingredient_stock(sender, instance, created, **kwargs):    
-    ingredient = instance.ingredient
-    qty = instance.quantity if isinstance(instance.quantity, Decimal) else Decimal(str(instance.quantity))
-    if instance.transaction_type == 'purchase':
-        ingredient.current_stock = ingredient.current_stock + qty
-    elif instance.transaction_type in ['usage', 'wastage']:
-        new_stock = ingredient.current_stock - qty
-        if new_stock < 0:
-            raise ValueError(f"Stock for ingredient '{ingredient.name}' cannot go negative. Current: {ingredient.current_stock}, Tried to reduce by: {qty}")
-        ingredient.current_stock = new_stock
-    elif instance.transaction_type == 'adjustment':
-        if qty < 0:
-            raise ValueError(f"Stock for ingredient '{ingredient.name}' cannot be set to negative value: {qty}")
-        ingredient.current_stock = qty
-    ingredient.save()
@@ -10,7 +10,7 @@ class IngredientCreationRequest(BaseModel):
 class IngredientUpdateRequest(BaseModel):
     name: Optional[str] = None
     unit: Optional[str] = None
-    current_stock: Optional[float] = None
+    current_stock: Optional[Annotated[float, Field(ge=0, description="Counted stock; recorded as an adjustment transaction")]] = None
     minimum_stock: Optional[float] = None
     # is_active is handled by a separate API
 
@@ -1,6 +1,7 @@
 from .request import IngredientCreationRequest, IngredientUpdateRequest, MenuItemIngredientCreateRequest, MenuItemIngredientUpdateRequest, InventoryTransactionCreateRequest, InventoryTransactionUpdateRequest
 from .response import IngredientCreationResponse, IngredientObject, IngredientObjects, MenuItemIngredientObject, MenuItemIngredientObjects, InventoryTransactionObject, InventoryTransactionObjects
 from .models import Ingredient, MenuItemIngredient, InventoryTransaction
+from .ledger import StockLedger
 from Menu.models import MenuItem
 from fastapi import HTTPException, status
 from core.utils.asyncs import get_queryset, get_related_object
@@ -75,10 +76,29 @@ class InventoryService:
         try:
             ingredient = await Ingredient.objects.aget(slug=slug, outlet=outlet)
             update_fields = body.dict(exclude_unset=True)
+            # A stock edit is an inventory count: it goes through the ledger as an adjustment
+            new_stock = update_fields.pop("current_stock", None)
+            changed_fields = []
             for field, value in update_fields.items():
                 if hasattr(ingredient, field):
                     setattr(ingredient, field, value)
-            await ingredient.asave()
+                    changed_fields.append(field)
+
+            def save():
+                with transaction.atomic():
+                    # Only write the edited columns so concurrent stock movements are not overwritten
+                    ingredient.save(update_fields=[*changed_fields, "updated_at"])
+                    if new_stock is not None:
+                        StockLedger().record(InventoryTransaction(
+                            ingredient=ingredient,
+                            transaction_type="adjustment",
+                            quantity=new_stock,
+                            note="Stock set from the ingredient update",
+                            outlet=outlet
+                        ))
+                        ingredient.refresh_from_db(fields=["current_stock"])
+
+            await sync_to_async(save)()
             return IngredientObject(
                 name=ingredient.name,
                 unit=ingredient.unit,
@@ -92,6 +112,11 @@ class InventoryService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Ingredient not found."
             )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -118,7 +143,7 @@ class InventoryService:
         try:
             ingredient = await Ingredient.objects.aget(slug=slug, outlet=outlet)
             ingredient.is_active = is_active
-            await ingredient.asave()
+            await ingredient.asave(update_fields=["is_active", "updated_at"])
             return IngredientObject(
                 name=ingredient.name,
                 unit=ingredient.unit,
@@ -299,19 +324,19 @@ class InventoryService:
     async def create_transaction(self, body: InventoryTransactionCreateRequest, outlet) -> InventoryTransactionObject:        
         try:
             ingredient = await Ingredient.objects.aget(slug=body.ingredient_slug, outlet=outlet)
-            transaction = await InventoryTransaction.objects.acreate(
+            transaction = await sync_to_async(StockLedger().record)(InventoryTransaction(
                 ingredient=ingredient,
                 transaction_type=body.transaction_type,
                 quantity=body.quantity,
                 note=body.note,
                 outlet=outlet
-            )
+            ))
             return InventoryTransactionObject(
-                ingredient_slug=transaction.ingredient.slug,
+                ingredient_slug=ingredient.slug,
                 transaction_type=transaction.transaction_type,
                 quantity=float(transaction.quantity),
                 note=transaction.note,
-                outlet_slug=transaction.outlet.slug,
+                outlet_slug=outlet.slug,
                 slug=transaction.slug
             )
         except Ingredient.DoesNotExist:
@@ -319,6 +344,11 @@ class InventoryService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Ingredient not found."
             )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -350,18 +380,19 @@ class InventoryService:
 
     async def update_transaction(self, slug: str, body: InventoryTransactionUpdateRequest, outlet) -> InventoryTransactionObject:        
         try:
-            transaction = await InventoryTransaction.objects.aget(slug=slug, outlet=outlet)
+            transaction = await InventoryTransaction.objects.select_related("ingredient").aget(slug=slug, outlet=outlet)
+            previous_type, previous_quantity = transaction.transaction_type, transaction.quantity
             update_fields = body.dict(exclude_unset=True)
             for field, value in update_fields.items():
                 if hasattr(transaction, field):
                     setattr(transaction, field, value)
-            await transaction.asave()
+            await sync_to_async(StockLedger().revise)(transaction, previous_type, previous_quantity)
             return InventoryTransactionObject(
                 ingredient_slug=transaction.ingredient.slug,
                 transaction_type=transaction.transaction_type,
                 quantity=float(transaction.quantity),
                 note=transaction.note,
-                outlet_slug=transaction.outlet.slug,
+                outlet_slug=outlet.slug,
                 slug=transaction.slug
             )
         except InventoryTransaction.DoesNotExist:
@@ -369,6 +400,11 @@ class InventoryService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found."
             )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,7 +1,9 @@
 from django.contrib import admin
-from .models import MenuCategory, MenuItem, CategoryImage
+from .models import MenuCategory, MenuItem, CategoryImage, AIJob, UploadSession
 # Register your models here.
 
 admin.site.register(MenuCategory)
 admin.site.register(MenuItem) 
 admin.site.register(CategoryImage)
+admin.site.register(AIJob)
+admin.site.register(UploadSession)
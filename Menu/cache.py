@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+import redis
+from django.conf import settings
+from django.db import transaction
+
+from core.models import Outlet
+from core.utils.cache import (
+    abump_content_version,
+    bump_content_version,
+    get_async_redis_client,
+    get_content_version,
+)
+from core.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    """A serialized public menu response, ready to be written to the socket."""
+    version: int | None
+    body: bytes
+    encoding: str
+
+
+def menu_scope(outlet_slug: str) -> str:
+    return f"menu:{outlet_slug}"
+
+
+def _snapshot_key(outlet_slug: str, version: int) -> str:
+    return f"menu_snapshot:{outlet_slug}:{version}"
+
+
+def bump_menu_version(outlet_slug: str) -> None:
+    """
+    Invalidates every cached public menu representation of an outlet.
+    Deferred until the surrounding transaction commits so readers never cache
+    a snapshot built from data that is about to change.
+    """
+    transaction.on_commit(lambda: bump_content_version(menu_scope(outlet_slug)))
+
+
+def bump_menu_version_for_outlet_id(outlet_id: int | None) -> None:
+    if outlet_id is None:
+        return
+    outlet_slug = Outlet.objects.filter(pk=outlet_id).values_list("slug", flat=True).first()
+    if outlet_slug:
+        bump_menu_version(outlet_slug)
+
+
+async def abump_menu_version(outlet_slug: str) -> None:
+    """
+    Async variant for service code that changes the menu without model signals
+    (e.g. `abulk_update`). Must be awaited after the write has been committed.
+    """
+    await abump_content_version(menu_scope(outlet_slug))
+
+
+async def get_menu_version(outlet_slug: str) -> int | None:
+    return await get_content_version(menu_scope(outlet_slug))
+
+
+async def read_menu_snapshot(outlet_slug: str, version: int, franchise_id: int, encoding: str) -> bytes | None:
+    """
+    Returns the snapshot body in the requested encoding, or None on a miss.
+    Snapshots built for another franchise are treated as misses so outlets
+    stay scoped to the franchise resolved from the subdomain.
+    """
+    try:
+        owner, body = await get_async_redis_client().hmget(
+            _snapshot_key(outlet_slug, version), "franchise_id", encoding
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read menu snapshot for '{outlet_slug}': {e}")
+        return None
+    if owner is None or int(owner) != franchise_id:
+        return None
+    return body
+
+
+async def write_menu_snapshot(outlet_slug: str, version: int, franchise_id: int, variants: dict[str, bytes]) -> None:
+    key = _snapshot_key(outlet_slug, version)
+    try:
+        pipe = get_async_redis_client().pipeline()
+        pipe.hset(key, mapping={"franchise_id": franchise_id, **variants})
+        pipe.expire(key, settings.MENU_SNAPSHOT_TTL)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to store menu snapshot for '{outlet_slug}': {e}")
@@ -0,0 +1,138 @@
+from django.conf import settings
+from qdrant_client.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    Distance,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    KeywordIndexType,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
+
+from core.utils.constants import MENUITEM_COLLECTION_NAME
+from core.utils.logger import logger
+from .embeddings import get_embedding_provider
+
+# MENUITEM_COLLECTION_NAME is a Qdrant alias; the collection behind it is
+# versioned ("menu_items_<timestamp>") so a full reindex can build a fresh one
+# and swap the alias atomically. Older deployments may still have a plain
+# collection under the alias name; that keeps working until the first reindex.
+
+
+async def resolve_menu_item_collection(client) -> str | None:
+    """
+    Returns the name of the collection currently serving MENUITEM_COLLECTION_NAME,
+    or None if there is none yet.
+    """
+    aliases = await client.get_aliases()
+    for alias in aliases.aliases:
+        if alias.alias_name == MENUITEM_COLLECTION_NAME:
+            return alias.collection_name
+    if await client.collection_exists(MENUITEM_COLLECTION_NAME):
+        return MENUITEM_COLLECTION_NAME
+    return None
+
+
+def menu_item_search_params() -> SearchParams:
+    """
+    Searches run on the int8 vectors and rescore the oversampled top hits with
+    the original vectors, which keeps recall close to unquantized search.
+    """
+    return SearchParams(
+        hnsw_ef=settings.QDRANT_SEARCH_HNSW_EF,
+        quantization=QuantizationSearchParams(
+            rescore=True, oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING
+        ),
+    )
+
+
+async def ensure_menu_item_payload_indexes(client, collection_name: str) -> None:
+    """
+    Every search filters on outlet_slug and the indexer looks points up by slug.
+    outlet_slug is marked as the tenant key, so Qdrant stores each outlet's points
+    together and builds per-outlet HNSW links (payload_m); filtered search then
+    stays fast however many outlets share the collection. Idempotent.
+    """
+    await client.create_payload_index(
+        collection_name=collection_name,
+        field_name="outlet_slug",
+        field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+    )
+    await client.create_payload_index(
+        collection_name=collection_name,
+        field_name="slug",
+        field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+    )
+
+
+async def create_menu_item_collection(client, collection_name: str) -> None:
+    """
+    Vectors are scalar-quantized to int8 and the quantized copy is kept in RAM
+    (a quarter of the float32 size); the originals, only read for rescoring, stay
+    on disk unless QDRANT_VECTORS_ON_DISK is turned off.
+    """
+    await client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(
+            size=get_embedding_provider().dimensions,
+            distance=Distance.COSINE,
+            on_disk=settings.QDRANT_VECTORS_ON_DISK,
+        ),
+        hnsw_config=HnswConfigDiff(
+            m=settings.QDRANT_HNSW_M,
+            ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+            payload_m=settings.QDRANT_HNSW_PAYLOAD_M,
+        ),
+        quantization_config=ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+    )
+    await ensure_menu_item_payload_indexes(client, collection_name)
+
+
+async def ensure_menu_item_collection(client) -> None:
+    """
+    Creates the menu item collection and its alias on first start, and makes
+    sure the served collection has its payload indexes.
+    """
+    current = await resolve_menu_item_collection(client)
+    if current is not None:
+        # Collections created before the payload indexes existed get them here;
+        # quantization and HNSW settings are applied by the next full reindex.
+        await ensure_menu_item_payload_indexes(client, current)
+        return
+    collection_name = f"{MENUITEM_COLLECTION_NAME}_initial"
+    if not await client.collection_exists(collection_name):
+        await create_menu_item_collection(client, collection_name)
+    await point_menu_item_alias(client, collection_name)
+    logger.info(f"Created Qdrant collection '{collection_name}' as '{MENUITEM_COLLECTION_NAME}'")
+
+
+async def point_menu_item_alias(client, collection_name: str) -> str | None:
+    """
+    Points MENUITEM_COLLECTION_NAME at `collection_name` in one alias update, so
+    searches switch from the old collection to the new one without a gap.
+    Returns the collection that was served before.
+    """
+    previous = await resolve_menu_item_collection(client)
+    operations = []
+    if previous == MENUITEM_COLLECTION_NAME:
+        # A plain collection holds the alias name; it has to go before the alias can exist.
+        logger.warning(f"Dropping legacy Qdrant collection '{MENUITEM_COLLECTION_NAME}' to replace it with an alias")
+        await client.delete_collection(MENUITEM_COLLECTION_NAME)
+    elif previous is not None:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=MENUITEM_COLLECTION_NAME)))
+    operations.append(
+        CreateAliasOperation(
+            create_alias=CreateAlias(collection_name=collection_name, alias_name=MENUITEM_COLLECTION_NAME)
+        )
+    )
+    await client.update_collection_aliases(change_aliases_operations=operations)
+    return previous
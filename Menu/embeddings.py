@@ -0,0 +1,181 @@
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from array import array
+
+import redis
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from google.genai import types
+
+from core.utils.cache import LocalTTLCache, get_async_redis_client
+from core.utils.clients import get_async_genai_client
+from core.utils.constants import GEMINI_EMBEDDINGS_MODEL
+from core.utils.logger import logger
+
+# Hot queries ("spicy", "veg", "paneer") are served from this worker's memory;
+# the Redis tier shares embeddings between workers and survives restarts.
+# Vectors are kept as float32 arrays (4 bytes per dimension) in both tiers.
+query_embedding_cache = LocalTTLCache(
+    "query_embeddings",
+    maxsize=settings.QUERY_EMBEDDING_CACHE_MAXSIZE,
+    ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+)
+
+
+class EmbeddingProvider(ABC):
+    """
+    Turns texts into vectors for the menu item collection. Subclasses set `name`
+    (part of every cache key, so switching providers never mixes vectors),
+    `dimensions` and `max_batch_size`, and implement `embed`.
+    """
+    name: str
+    dimensions: int
+    max_batch_size: int
+
+    @abstractmethod
+    async def embed(self, contents: list[str]) -> list[list[float]]:
+        ...
+
+
+class GeminiEmbeddingProvider(EmbeddingProvider):
+    # Gemini's batchEmbedContents accepts at most 100 inputs per call.
+    max_batch_size = 100
+
+    def __init__(self, model: str = GEMINI_EMBEDDINGS_MODEL, dimensions: int = 768):
+        self.model = model
+        self.name = f"gemini:{model}:{dimensions}"
+        self.dimensions = dimensions
+        self.config = types.EmbedContentConfig(output_dimensionality=dimensions)
+
+    async def embed(self, contents: list[str]) -> list[list[float]]:
+        response = await get_async_genai_client().models.embed_content(
+            model=self.model, contents=contents, config=self.config
+        )
+
+        if not response.embeddings:
+            raise ValueError("No embeddings returned from Gemini.")
+
+        return [embedding.values for embedding in response.embeddings]
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic, offline embeddings: words, word bigrams and character
+    trigrams are hashed into `dimensions` signed buckets and the vector is L2
+    normalized. Texts sharing words or word fragments score as similar, which is
+    enough to exercise indexing and search without network access.
+    """
+    max_batch_size = 1000
+
+    def __init__(self, dimensions: int = 768):
+        self.name = f"hashing:{dimensions}"
+        self.dimensions = dimensions
+
+    @staticmethod
+    def _features(text: str):
+        words = re.findall(r"\w+", text.lower())
+        for word in words:
+            yield word, 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], 0.5
+        for first, second in zip(words, words[1:]):
+            yield f"{first} {second}", 0.5
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for feature, weight in self._features(text):
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+            # The lowest bit picks the sign so colliding features tend to cancel out
+            vector[(digest >> 1) % self.dimensions] += weight if digest & 1 else -weight
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+
+    async def embed(self, contents: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in contents]
+
+
+EMBEDDING_PROVIDERS = {
+    "gemini": GeminiEmbeddingProvider,
+    "hashing": HashingEmbeddingProvider,
+}
+
+_embedding_provider: EmbeddingProvider | None = None
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """
+    Returns the provider selected by the EMBEDDING_PROVIDER setting.
+    """
+    global _embedding_provider
+    if _embedding_provider is None:
+        try:
+            provider_class = EMBEDDING_PROVIDERS[settings.EMBEDDING_PROVIDER]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"Unknown EMBEDDING_PROVIDER '{settings.EMBEDDING_PROVIDER}', expected one of: {', '.join(EMBEDDING_PROVIDERS)}"
+            )
+        _embedding_provider = provider_class(dimensions=settings.EMBEDDING_DIMENSIONS)
+    return _embedding_provider
+
+
+async def generate_embeddings(contents: list[str]) -> list[list[float]]:
+    """
+    Generates embeddings for the given contents using the configured provider.
+    Returns a list of embeddings; callers batch by `max_batch_size`.
+    """
+    return await get_embedding_provider().embed(contents)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _query_embedding_key(provider: EmbeddingProvider, normalized_query: str) -> str:
+    digest = hashlib.blake2b(normalized_query.encode(), digest_size=16).hexdigest()
+    return f"query_embedding:{provider.name}:{digest}"
+
+
+async def _read_redis_embedding(key: str) -> array | None:
+    try:
+        raw = await get_async_redis_client().get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read query embedding from Redis: {e}")
+        return None
+    if not raw:
+        return None
+    vector = array("f")
+    vector.frombytes(raw)
+    return vector
+
+
+async def _write_redis_embedding(key: str, vector: array) -> None:
+    try:
+        await get_async_redis_client().set(key, vector.tobytes(), ex=settings.QUERY_EMBEDDING_REDIS_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to store query embedding in Redis: {e}")
+
+
+async def embed_query(query: str) -> list[float]:
+    """
+    Returns the embedding of a search query, going to the embedding provider only
+    when neither the in-process nor the Redis tier has it. Queries are normalized
+    (case and whitespace) before embedding, so equivalent queries share one entry.
+    """
+    provider = get_embedding_provider()
+    normalized = normalize_query(query)
+    key = _query_embedding_key(provider, normalized)
+
+    found, vector = query_embedding_cache.get(key)
+    if found and vector is not None:
+        return vector.tolist()
+
+    vector = await _read_redis_embedding(key)
+    if vector is None:
+        [embedding] = await provider.embed([normalized])
+        vector = array("f", embedding)
+        await _write_redis_embedding(key, vector)
+    query_embedding_cache.set(key, vector)
+    return vector.tolist()
@@ -0,0 +1,95 @@
+import hashlib
+import re
+import threading
+import unicodedata
+from typing import Callable
+
+import redis
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+
+from core.utils.cache import get_redis_client
+from core.utils.images import ingest_image
+from core.utils.logger import logger
+from .models import CategoryImage
+
+# How long one generation may hold the lock, and how long others wait for it.
+# Gemini image generation with retries stays well below this.
+GENERATION_LOCK_TIMEOUT = 300
+
+# Threads of this process serialize on a fixed set of lock stripes; names that
+# share a stripe just wait for each other, which only costs latency.
+LOCAL_LOCK_STRIPES = 64
+_local_locks = [threading.Lock() for _ in range(LOCAL_LOCK_STRIPES)]
+
+
+def normalize_image_name(name: str) -> str:
+    """
+    "Starters", "starters " and "ＳＴＡＲＴＥＲＳ" all map to "starters".
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", name)).strip().casefold()[:100]
+
+
+def image_cache_key(kind: str, normalized_name: str) -> str:
+    digest = hashlib.blake2b(f"{kind}:{normalized_name}".encode(), digest_size=16).hexdigest()
+    return f"ai_image:{digest}"
+
+
+def _local_lock(key: str) -> threading.Lock:
+    # The key already ends in a hex digest
+    return _local_locks[int(key[-8:], 16) % LOCAL_LOCK_STRIPES]
+
+
+def get_cached_image(kind: str, name: str) -> CategoryImage | None:
+    return CategoryImage.objects.filter(kind=kind, normalized_name=normalize_image_name(name)).first()
+
+
+async def aget_cached_image(kind: str, name: str) -> CategoryImage | None:
+    return await CategoryImage.objects.filter(kind=kind, normalized_name=normalize_image_name(name)).afirst()
+
+
+def get_or_generate_image(kind: str, name: str, generate: Callable[[], ContentFile]) -> CategoryImage:
+    """
+    Returns the shared image for a category or food name, calling `generate`
+    only if no outlet has needed that name before.
+
+    Generation is single-flight: worker threads in this process queue on a
+    local lock, other processes on a Redis lock, and whoever gets it second
+    finds the image the first one stored. Blocking; meant for Celery workers.
+    """
+    normalized = normalize_image_name(name)
+    cached = CategoryImage.objects.filter(kind=kind, normalized_name=normalized).first()
+    if cached:
+        return cached
+
+    key = image_cache_key(kind, normalized)
+    with _local_lock(key):
+        distributed_lock = get_redis_client().lock(
+            f"lock:{key}", timeout=GENERATION_LOCK_TIMEOUT, blocking_timeout=GENERATION_LOCK_TIMEOUT
+        )
+        try:
+            acquired = distributed_lock.acquire()
+        except redis.RedisError as e:
+            # Without Redis, the unique constraint below still keeps one image per name
+            logger.warning(f"Image generation lock unavailable for '{normalized}': {e}")
+            acquired = False
+        try:
+            cached = CategoryImage.objects.filter(kind=kind, normalized_name=normalized).first()
+            if cached:
+                return cached
+            content = generate()
+            try:
+                with transaction.atomic():
+                    image = CategoryImage(kind=kind, category_name=name[:100], normalized_name=normalized)
+                    image.image_variants = ingest_image(image.image, content.read(), key.split(":")[1])
+                    image.save()
+                    return image
+            except IntegrityError:
+                return CategoryImage.objects.get(kind=kind, normalized_name=normalized)
+        finally:
+            if acquired:
+                try:
+                    distributed_lock.release()
+                except redis.RedisError as e:
+                    # Expired or unreachable; the lock times out on its own
+                    logger.warning(f"Failed to release image generation lock for '{normalized}': {e}")
@@ -0,0 +1,183 @@
+import hashlib
+import uuid
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchAny, PointIdsList, PointStruct
+
+from core.utils.cache import get_redis_client
+from core.utils.clients import get_async_qdrant_client
+from core.utils.constants import MENUITEM_COLLECTION_NAME
+from core.utils.logger import logger
+from .embeddings import generate_embeddings, get_embedding_provider
+from .utils import menu_item_description_splitter
+
+
+def _pending_key(outlet_slug: str) -> str:
+    return f"menu_index:pending:{outlet_slug}"
+
+
+def _scheduled_key(outlet_slug: str) -> str:
+    return f"menu_index:scheduled:{outlet_slug}"
+
+
+def schedule_menu_item_index(outlet_slug: str, item_slug: str) -> None:
+    """
+    Queues a menu item for (re)indexing once the surrounding transaction commits.
+
+    Slugs are collected in a per-outlet Redis set, so repeated saves of the same
+    item collapse into one entry. The first item queued for an outlet schedules a
+    flush MENU_INDEX_DEBOUNCE_SECONDS later; items queued in the meantime ride
+    along with it.
+    """
+    transaction.on_commit(lambda: _enqueue(outlet_slug, item_slug))
+
+
+def _enqueue(outlet_slug: str, item_slug: str) -> None:
+    from .tasks import flush_menu_index_task  # the task module imports this one
+
+    delay = settings.MENU_INDEX_DEBOUNCE_SECONDS
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.sadd(_pending_key(outlet_slug), item_slug)
+        # The marker outlives the countdown so a slow queue cannot double-schedule;
+        # the flush deletes it before draining the set.
+        pipe.set(_scheduled_key(outlet_slug), 1, nx=True, ex=delay * 10)
+        _, newly_scheduled = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Menu index queue unavailable, indexing '{item_slug}' directly: {e}")
+        flush_menu_index_task.delay(outlet_slug, [item_slug])
+        return
+    if newly_scheduled:
+        flush_menu_index_task.apply_async(args=[outlet_slug], countdown=delay)
+
+
+def drain_pending(outlet_slug: str) -> list[str]:
+    """
+    Atomically takes every queued slug of an outlet and clears the debounce
+    marker, so items saved while this flush runs schedule a new one.
+    """
+    pipe = get_redis_client().pipeline(transaction=True)
+    pipe.delete(_scheduled_key(outlet_slug))
+    pipe.smembers(_pending_key(outlet_slug))
+    pipe.delete(_pending_key(outlet_slug))
+    _, slugs, _ = pipe.execute()
+    return [slug.decode() for slug in slugs]
+
+
+def requeue(outlet_slug: str, item_slugs: list[str]) -> None:
+    """
+    Puts slugs back after a failed flush; the next save or retry picks them up.
+    """
+    if item_slugs:
+        get_redis_client().sadd(_pending_key(outlet_slug), *item_slugs)
+
+
+def _point_id(item_slug: str, chunk_index: int) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{item_slug}_{chunk_index}"))
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def description_fingerprint(description: str | None) -> str:
+    """
+    Fingerprint of the text that ends up in the index; used by the MenuItem
+    signal to tell embedding-relevant saves from price/availability edits.
+    """
+    return chunk_hash(description or "")
+
+
+def menu_item_point(item_slug: str, outlet_slug: str, chunk_index: int, digest: str, embedding: list[float]) -> PointStruct:
+    return PointStruct(
+        id=_point_id(item_slug, chunk_index),
+        vector=embedding,
+        payload={"slug": item_slug, "outlet_slug": outlet_slug, "chunk_index": chunk_index, "chunk_hash": digest},
+    )
+
+
+async def _indexed_chunk_hashes(qdrant_client, item_slugs: list[str]) -> dict[str, str | None]:
+    """
+    Returns {point_id: chunk_hash} for the points already stored for the items.
+    Points written before chunk hashes existed map to None and are re-embedded.
+    """
+    indexed = {}
+    offset = None
+    while True:
+        points, offset = await qdrant_client.scroll(
+            collection_name=MENUITEM_COLLECTION_NAME,
+            scroll_filter=Filter(must=[FieldCondition(key="slug", match=MatchAny(any=item_slugs))]),
+            with_payload=["chunk_hash"],
+            with_vectors=False,
+            limit=256,
+            offset=offset,
+        )
+        for point in points:
+            indexed[str(point.id)] = (point.payload or {}).get("chunk_hash")
+        if offset is None:
+            return indexed
+
+
+async def index_menu_items(outlet_slug: str, item_slugs: list[str]) -> int:
+    """
+    Brings the indexed chunks of the given items in line with their descriptions.
+
+    Every chunk's content hash is stored in its point payload; only chunks whose
+    hash changed are embedded (in batched provider calls) and written with one
+    upsert. Chunks beyond the end of a shortened description, and all chunks of
+    items that no longer exist, are deleted. Returns the number of chunks embedded.
+    """
+    from .models import MenuItem  # Menu.models imports this module
+
+    items = [
+        item async for item in MenuItem.objects.filter(
+            slug__in=item_slugs, category__outlet__slug=outlet_slug
+        ).values("slug", "description")
+    ]
+    qdrant_client = get_async_qdrant_client()
+
+    missing = set(item_slugs) - {item["slug"] for item in items}
+    if missing:
+        await qdrant_client.delete(
+            collection_name=MENUITEM_COLLECTION_NAME,
+            points_selector=FilterSelector(
+                filter=Filter(must=[FieldCondition(key="slug", match=MatchAny(any=list(missing)))])
+            ),
+        )
+    if not items:
+        return 0
+
+    indexed = await _indexed_chunk_hashes(qdrant_client, [item["slug"] for item in items])
+
+    changed = []  # (item_slug, chunk_index, text, hash)
+    for item in items:
+        texts = menu_item_description_splitter.split_text(item["description"] or "")
+        for i, text in enumerate(texts):
+            digest = chunk_hash(text)
+            if indexed.pop(_point_id(item["slug"], i), None) != digest:
+                changed.append((item["slug"], i, text, digest))
+    # Whatever is left belongs to chunks past the end of a shortened description
+    stale_ids = list(indexed)
+
+    if stale_ids:
+        await qdrant_client.delete(
+            collection_name=MENUITEM_COLLECTION_NAME,
+            points_selector=PointIdsList(points=stale_ids),
+        )
+    if not changed:
+        return 0
+
+    batch_size = get_embedding_provider().max_batch_size
+    embeddings = []
+    for start in range(0, len(changed), batch_size):
+        batch = changed[start:start + batch_size]
+        embeddings.extend(await generate_embeddings([text for _, _, text, _ in batch]))
+
+    points = [
+        menu_item_point(item_slug, outlet_slug, i, digest, embedding)
+        for (item_slug, i, _, digest), embedding in zip(changed, embeddings)
+    ]
+    await qdrant_client.upsert(collection_name=MENUITEM_COLLECTION_NAME, points=points)
+    return len(points)
@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.images import delete_replaced_image, ingest_image
+from core.utils.logger import logger
+from .cache import bump_menu_version
+from .indexer import schedule_menu_item_index
+from .image_cache import get_or_generate_image
+from .models import AIJob, MenuCategory, MenuItem
+from .utils import (
+    GEMINI_DESCRIPTION_CONCURRENCY,
+    enhance_menu_item_descriptions_sync,
+    generate_menu_category_image_sync,
+    generate_menu_item_image_sync,
+)
+
+
+async def enqueue_ai_job(kind: str, outlet, target_slug: str, params: dict | None = None) -> AIJob:
+    """
+    Creates a pending job and hands it to the worker. A job that is still
+    pending or running for the same target is returned instead of queueing a
+    duplicate, so repeated clicks do not pay for several generations. Jobs
+    without an update for AI_JOB_STALE_SECONDS are marked failed instead.
+    """
+    from .tasks import enhance_descriptions_task, generate_image_task  # the task module imports this one
+
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.AI_JOB_STALE_SECONDS)
+    in_flight = AIJob.objects.filter(
+        outlet=outlet, kind=kind, target_slug=target_slug, status__in=("pending", "running")
+    )
+    await in_flight.filter(updated_at__lt=stale_before).aupdate(
+        status="failed", error="The job stopped making progress and was abandoned.", updated_at=now
+    )
+    existing = await in_flight.filter(updated_at__gte=stale_before).order_by("-created_at").afirst()
+    if existing:
+        return existing
+    job = await AIJob.objects.acreate(kind=kind, outlet=outlet, target_slug=target_slug, params=params or {})
+    task = enhance_descriptions_task if kind == "description_enhancement" else generate_image_task
+    task.delay(job.slug)
+    return job
+
+
+def _update(job: AIJob, **fields) -> None:
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.save(update_fields=[*fields, "updated_at"])
+
+
+def _generate_menu_item_image(job: AIJob) -> dict:
+    item = MenuItem.objects.select_related("category").get(
+        slug=job.target_slug, category__outlet_id=job.outlet_id
+    )
+    _update(job, progress=10)
+    generate = lambda: generate_menu_item_image_sync(item.name, item.description or "")
+    if job.params.get("fresh"):
+        image = generate()
+    else:
+        # Items get their own copy of the shared image, so deleting or
+        # replacing an item's image never touches the cache
+        shared = get_or_generate_image("menu_item", item.name, generate)
+        with shared.image.open("rb") as f:
+            image = ContentFile(f.read())
+    _update(job, progress=80)
+    previous_image, previous_variants = item.image.name, item.image_variants
+    item.image_variants = ingest_image(item.image, image.read(), item.slug)
+    # Only the image changed, so the embedding signal skips re-indexing
+    item.save(update_fields=["image", "image_variants", "updated_at"])
+    delete_replaced_image(item.image, previous_image, previous_variants)
+    return {"image": item.image.url}
+
+
+def _generate_category_image(job: AIJob) -> dict:
+    category = MenuCategory.objects.get(slug=job.target_slug, outlet_id=job.outlet_id)
+    _update(job, progress=10)
+    image = get_or_generate_image(
+        "category", category.name, lambda: generate_menu_category_image_sync(category.name)
+    )
+    category.image = image
+    category.save(update_fields=["image", "updated_at"])
+    return {"image": image.image.url}
+
+
+def _enhance_descriptions(job: AIJob) -> dict:
+    """
+    Enhances the descriptions of an outlet's (or one category's) items in
+    multi-item prompts, several batches at a time. Nothing is written to the
+    items: the result is a before/after diff that apply_description_enhancement
+    writes back once reviewed.
+    """
+    items = MenuItem.objects.filter(category__outlet_id=job.outlet_id)
+    if job.params.get("category_slug"):
+        items = items.filter(category__slug=job.params["category_slug"])
+    items = list(items.order_by("category__display_order", "display_order").values("slug", "name", "description"))
+    size = settings.MENU_BULK_ENHANCE_BATCH_SIZE
+    batches = [items[start:start + size] for start in range(0, len(items), size)]
+
+    changes = []
+    failed = []
+    workers = min(settings.MENU_BULK_ENHANCE_CONCURRENCY, GEMINI_DESCRIPTION_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                enhance_menu_item_descriptions_sync,
+                [(item["name"], item["description"] or "") for item in batch],
+            ): batch
+            for batch in batches
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            batch = futures[future]
+            try:
+                enhanced = future.result()
+            except Exception as e:
+                logger.error(f"AI job {job.slug}: batch of {len(batch)} items failed: {e}")
+                failed.extend(item["slug"] for item in batch)
+                enhanced = [None] * len(batch)
+            for item, after in zip(batch, enhanced):
+                before = item["description"] or ""
+                if after is None:
+                    if item["slug"] not in failed:
+                        failed.append(item["slug"])
+                elif after != before.strip():
+                    changes.append({"slug": item["slug"], "name": item["name"], "before": before, "after": after})
+            _update(job, progress=min(99, done * 100 // len(batches)))
+    if items and len(failed) == len(items):
+        raise RuntimeError("No descriptions could be enhanced.")
+    return {"changes": changes, "failed": failed}
+
+
+def apply_description_enhancement(job: AIJob, slugs: list[str] | None = None) -> dict:
+    """
+    Writes the reviewed descriptions of a finished enhancement job back with one
+    bulk_update, optionally limited to `slugs`. Items edited since the preview
+    was generated are skipped rather than overwritten.
+    """
+    changes = {
+        change["slug"]: change for change in job.result.get("changes", [])
+        if slugs is None or change["slug"] in slugs
+    }
+    now = timezone.now()
+    applied = []
+    skipped = []
+    with transaction.atomic():
+        items = MenuItem.objects.select_for_update().filter(slug__in=changes, category__outlet_id=job.outlet_id)
+        for item in items:
+            change = changes[item.slug]
+            if (item.description or "") != change["before"]:
+                skipped.append(item.slug)
+                continue
+            item.description = change["after"]
+            item.updated_at = now  # bulk_update bypasses auto_now
+            applied.append(item)
+        MenuItem.objects.bulk_update(applied, ["description", "updated_at"])
+        job.status = "applied"
+        job.result = {**job.result, "applied": [item.slug for item in applied], "skipped": skipped}
+        job.save(update_fields=["status", "result", "updated_at"])
+
+    # bulk_update sends no post_save, so do what the MenuItem signals would
+    outlet_slug = job.outlet.slug
+    for item in applied:
+        schedule_menu_item_index(outlet_slug, item.slug)
+    bump_menu_version(outlet_slug)
+    return job.result
+
+
+JOB_RUNNERS = {
+    "menu_item_image": _generate_menu_item_image,
+    "category_image": _generate_category_image,
+    "description_enhancement": _enhance_descriptions,
+}
+
+
+def run_ai_job(job_slug: str) -> None:
+    """
+    Executes a job in the worker and records its outcome on the AIJob row.
+    """
+    job = AIJob.objects.get(slug=job_slug)
+    if job.status not in ("pending", "running"):
+        return  # redelivered after it finished, or abandoned as stale and replaced
+    _update(job, status="running", progress=0, error=None)
+    try:
+        result = JOB_RUNNERS[job.kind](job)
+    except Exception as e:
+        logger.error(f"AI job {job.slug} ({job.kind}) failed: {e}")
+        _update(job, status="failed", error=str(e))
+        raise
+    _update(job, status="succeeded", progress=100, result=result)
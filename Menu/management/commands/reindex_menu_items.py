@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from qdrant_client.models import FieldCondition, Filter, MatchValue, PointIdsList
+
+from core.models import Outlet
+from core.utils.cache import get_async_redis_client
+from core.utils.clients import get_async_qdrant_client
+from core.utils.constants import MENUITEM_COLLECTION_NAME
+from Menu.collection import create_menu_item_collection, point_menu_item_alias, resolve_menu_item_collection
+from Menu.embeddings import get_embedding_provider
+from Menu.indexer import chunk_hash, index_menu_items, menu_item_point
+from Menu.models import MenuItem
+from Menu.utils import menu_item_description_splitter
+
+CHECKPOINT_KEY = f"menu_reindex:checkpoint:{MENUITEM_COLLECTION_NAME}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the menu item vector index. Without --outlet, every outlet is embedded into a "
+        "fresh Qdrant collection which then replaces the live one by an atomic alias swap. "
+        "With --outlet, only those outlets are re-embedded in the live collection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--outlet', action='append', dest='outlets', default=[], help='Outlet slug to reindex in place (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=None, help="Chunks per embedding call (default: the provider's maximum)")
+        parser.add_argument('--concurrency', type=int, default=4, help='Embedding calls in flight at once')
+        parser.add_argument('--resume', action='store_true', help='Continue an interrupted full reindex from its checkpoint')
+        parser.add_argument('--keep-old', action='store_true', help='Keep the previous collection after the alias swap')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        if options['outlets'] and options['resume']:
+            raise CommandError("--resume only applies to a full reindex.")
+        asyncio.run(self.reindex(
+            outlets=options['outlets'],
+            batch_size=options['batch_size'] or get_embedding_provider().max_batch_size,
+            concurrency=options['concurrency'],
+            resume=options['resume'],
+            keep_old=options['keep_old'],
+        ))
+
+    async def reindex(self, outlets, batch_size, concurrency, resume, keep_old):
+        client = get_async_qdrant_client()
+        semaphore = asyncio.Semaphore(concurrency)
+        started = time.monotonic()
+        total_items = total_chunks = 0
+
+        if outlets:
+            target = await resolve_menu_item_collection(client)
+            if target is None:
+                raise CommandError("There is no menu item collection yet; run a full reindex first.")
+            checkpoint = None
+            outlet_slugs = [slug async for slug in Outlet.objects.filter(slug__in=outlets).values_list("slug", flat=True)]
+            unknown = set(outlets) - set(outlet_slugs)
+            if unknown:
+                raise CommandError(f"Unknown outlet(s): {', '.join(sorted(unknown))}")
+        else:
+            checkpoint = await self.load_checkpoint() if resume else None
+            if resume and checkpoint is None:
+                raise CommandError("There is no interrupted reindex to resume.")
+            if checkpoint is None:
+                checkpoint = {
+                    "collection": f"{MENUITEM_COLLECTION_NAME}_{int(time.time())}",
+                    "started_at": timezone.now().isoformat(),
+                    "completed_outlets": [],
+                }
+                await create_menu_item_collection(client, checkpoint["collection"])
+                await self.save_checkpoint(checkpoint)
+            else:
+                self.stdout.write(
+                    f"Resuming into '{checkpoint['collection']}', "
+                    f"{len(checkpoint['completed_outlets'])} outlet(s) already done."
+                )
+            target = checkpoint["collection"]
+            outlet_slugs = [
+                slug async for slug in Outlet.objects.exclude(
+                    slug__in=checkpoint["completed_outlets"]
+                ).order_by("id").values_list("slug", flat=True)
+            ]
+
+        for outlet_slug in outlet_slugs:
+            outlet_started = time.monotonic()
+            items, written_ids = await self.index_outlet(client, target, outlet_slug, batch_size, semaphore)
+            if checkpoint is None:
+                await self.delete_unwritten_points(client, target, outlet_slug, written_ids)
+            else:
+                checkpoint["completed_outlets"].append(outlet_slug)
+                await self.save_checkpoint(checkpoint)
+            total_items += items
+            total_chunks += len(written_ids)
+            self.stdout.write(
+                f"{outlet_slug}: {items} items, {len(written_ids)} chunks"
+                f"{self.rate(len(written_ids), time.monotonic() - outlet_started)}"
+            )
+
+        if checkpoint is not None:
+            previous = await point_menu_item_alias(client, target)
+            self.stdout.write(f"'{MENUITEM_COLLECTION_NAME}' now serves '{target}'.")
+            caught_up = await self.catch_up(datetime.fromisoformat(checkpoint["started_at"]))
+            if caught_up:
+                self.stdout.write(f"Re-embedded {caught_up} chunks of items edited during the rebuild.")
+            if previous and previous not in (target, MENUITEM_COLLECTION_NAME) and not keep_old:
+                await client.delete_collection(previous)
+                self.stdout.write(f"Deleted previous collection '{previous}'.")
+            await get_async_redis_client().delete(CHECKPOINT_KEY)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {total_items} items, {total_chunks} chunks"
+            f"{self.rate(total_chunks, time.monotonic() - started)}"
+        ))
+
+    async def index_outlet(self, client, target, outlet_slug, batch_size, semaphore) -> tuple[int, set[str]]:
+        """
+        Streams an outlet's items and embeds their description chunks in batches,
+        with at most `concurrency` batches in flight. Returns the item count and
+        the ids of the points written.
+        """
+        tasks = []
+        batch = []
+        written_ids = set()
+        items = 0
+
+        async def flush(batch):
+            try:
+                embeddings = await get_embedding_provider().embed([text for _, _, text in batch])
+                points = [
+                    menu_item_point(item_slug, outlet_slug, i, chunk_hash(text), embedding)
+                    for (item_slug, i, text), embedding in zip(batch, embeddings)
+                ]
+                await client.upsert(collection_name=target, points=points)
+                written_ids.update(str(point.id) for point in points)
+            finally:
+                semaphore.release()
+
+        async def submit(batch):
+            # Blocks while `concurrency` batches are in flight, which bounds memory too
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(flush(batch)))
+
+        queryset = MenuItem.objects.filter(category__outlet__slug=outlet_slug).values("slug", "description")
+        async for item in queryset.aiterator(chunk_size=2000):
+            items += 1
+            for i, text in enumerate(menu_item_description_splitter.split_text(item["description"] or "")):
+                batch.append((item["slug"], i, text))
+                if len(batch) >= batch_size:
+                    await submit(batch)
+                    batch = []
+        if batch:
+            await submit(batch)
+        await asyncio.gather(*tasks)
+        return items, written_ids
+
+    async def delete_unwritten_points(self, client, target, outlet_slug, written_ids):
+        """
+        After an in-place reindex, removes the outlet's points that were not
+        rewritten: deleted items and chunks past the end of shortened descriptions.
+        """
+        stale = []
+        offset = None
+        while True:
+            points, offset = await client.scroll(
+                collection_name=target,
+                scroll_filter=Filter(must=[FieldCondition(key="outlet_slug", match=MatchValue(value=outlet_slug))]),
+                with_payload=False,
+                with_vectors=False,
+                limit=1000,
+                offset=offset,
+            )
+            stale.extend(str(point.id) for point in points if str(point.id) not in written_ids)
+            if offset is None:
+                break
+        if stale:
+            await client.delete(collection_name=target, points_selector=PointIdsList(points=stale))
+
+    async def catch_up(self, since) -> int:
+        """
+        Edits made while the new collection was being built went to the old one;
+        runs them through the incremental indexer against the swapped alias.
+        """
+        slugs_by_outlet = defaultdict(list)
+        async for slug, outlet_slug in MenuItem.objects.filter(updated_at__gte=since).values_list("slug", "category__outlet__slug"):
+            slugs_by_outlet[outlet_slug].append(slug)
+        embedded = 0
+        for outlet_slug, slugs in slugs_by_outlet.items():
+            embedded += await index_menu_items(outlet_slug, slugs)
+        return embedded
+
+    async def load_checkpoint(self) -> dict | None:
+        raw = await get_async_redis_client().get(CHECKPOINT_KEY)
+        return json.loads(raw) if raw else None
+
+    async def save_checkpoint(self, checkpoint: dict) -> None:
+        await get_async_redis_client().set(CHECKPOINT_KEY, json.dumps(checkpoint))
+
+    @staticmethod
+    def rate(chunks: int, elapsed: float) -> str:
+        return f" in {elapsed:.1f}s ({chunks / elapsed:.0f} chunks/s)" if elapsed > 0 else ""
@@ -0,0 +1,62 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# search_vector is maintained by Postgres: name is weighted A, description B.
+# This replaces the post_save signals that issued a second UPDATE after every
+# save; queryset updates that do not touch name/description skip the trigger.
+SEARCH_VECTOR_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS {function}_trigger ON "{table}";
+CREATE TRIGGER {function}_trigger
+    BEFORE INSERT OR UPDATE OF name, description ON "{table}"
+    FOR EACH ROW EXECUTE FUNCTION {function}();
+
+UPDATE "{table}" SET search_vector =
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B');
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS {function}_trigger ON "{table}";
+DROP FUNCTION IF EXISTS {function}();
+"""
+
+TABLES = [
+    ("Menu_menuitem", "menu_menuitem_search_vector"),
+    ("Menu_menucategory", "menu_menucategory_search_vector"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Menu', '0002_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        *[
+            migrations.RunSQL(
+                SEARCH_VECTOR_TRIGGER_SQL.format(table=table, function=function),
+                DROP_SEARCH_VECTOR_TRIGGER_SQL.format(table=table, function=function),
+            )
+            for table, function in TABLES
+        ],
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='menu_item_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='menucategory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='menu_category_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
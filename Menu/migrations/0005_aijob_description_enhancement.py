@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Menu', '0004_aijob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aijob',
+            name='params',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='aijob',
+            name='kind',
+            field=models.CharField(choices=[('menu_item_image', 'Menu Item Image'), ('category_image', 'Category Image'), ('description_enhancement', 'Description Enhancement')], max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='aijob',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed'), ('applied', 'Applied')], default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='aijob',
+            name='target_slug',
+            field=models.SlugField(help_text='Slug of the menu item, category or outlet the job works on'),
+        ),
+    ]
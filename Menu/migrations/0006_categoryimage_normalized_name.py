@@ -0,0 +1,58 @@
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalize(name):
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", name)).strip().casefold()[:100]
+
+
+def backfill_normalized_names(apps, schema_editor):
+    """
+    Fills normalized_name and merges images whose names only differed in case or
+    whitespace ("Starters" / "starters "), keeping the oldest one.
+    """
+    CategoryImage = apps.get_model("Menu", "CategoryImage")
+    MenuCategory = apps.get_model("Menu", "MenuCategory")
+    kept = {}
+    for image in CategoryImage.objects.order_by("id"):
+        normalized = _normalize(image.category_name)
+        if normalized in kept:
+            MenuCategory.objects.filter(image=image).update(image=kept[normalized])
+            image.delete()
+            continue
+        image.normalized_name = normalized
+        image.save(update_fields=["normalized_name"])
+        kept[normalized] = image
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Menu', '0005_aijob_description_enhancement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoryimage',
+            name='kind',
+            field=models.CharField(choices=[('category', 'Category'), ('menu_item', 'Menu Item')], default='category', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='categoryimage',
+            name='normalized_name',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='categoryimage',
+            name='category_name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.RunPython(backfill_normalized_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='categoryimage',
+            constraint=models.UniqueConstraint(fields=('kind', 'normalized_name'), name='category_image_kind_normalized_name_uniq'),
+        ),
+    ]
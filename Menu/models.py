@@ -1,17 +1,34 @@
 from django.db import models
 from dishto.GlobalUtils import generate_unique_hash
-from django.db.models.signals import post_save, pre_save
-from django.contrib.postgres.search import SearchVectorField, SearchVector
+from django.db.models.signals import post_save, post_delete
+from django.contrib.postgres.search import SearchVectorField
 from django.dispatch import receiver
 from django.contrib.postgres.indexes import GinIndex
-from .tasks import generate_menu_item_embedding_task
-from core.models import TimeStampedModel
+from .indexer import schedule_menu_item_index, description_fingerprint
+from .cache import bump_menu_version, bump_menu_version_for_outlet_id
+from core.models import TimeStampedModel, Outlet
 
 # Create your models here.
 
 class CategoryImage(TimeStampedModel):
-    category_name = models.CharField(max_length=100, unique=True)
+    """
+    AI-generated images shared by every outlet and franchise, addressed by the
+    normalized category or food name (see Menu.image_cache).
+    """
+    KIND_CHOICES = (
+        ('category', 'Category'),
+        ('menu_item', 'Menu Item'),
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='category')
+    category_name = models.CharField(max_length=100)  # name as first requested
+    normalized_name = models.CharField(max_length=100)
     image = models.ImageField(upload_to='category_images/')
+    image_variants = models.JSONField(default=dict, blank=True)  # see core.utils.images.ingest_image
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "normalized_name"], name="category_image_kind_normalized_name_uniq"),
+        ]
 
 class MenuCategory(TimeStampedModel):
     name = models.CharField(max_length=100)
@@ -21,7 +38,7 @@ class MenuCategory(TimeStampedModel):
     display_order = models.PositiveIntegerField(default=0)
     slug = models.SlugField(unique=True, null=True, blank=True)
     image = models.ForeignKey(CategoryImage, on_delete=models.DO_NOTHING, null=True, blank=True)
-    search_vector = SearchVectorField(blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True)  # maintained by a DB trigger (migration 0003)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -33,14 +50,26 @@ class MenuCategory(TimeStampedModel):
     
     class Meta:
         indexes = [
-            GinIndex(fields=["search_vector"])  # ✅ GIN index for fast search
+            GinIndex(fields=["search_vector"]),  # ✅ GIN index for fast search
+            GinIndex(fields=["name"], name="menu_category_name_trgm", opclasses=["gin_trgm_ops"]),  # typo-tolerant fallback
         ]
 
-@receiver(post_save, sender=MenuCategory)
-def update_menu_category_vector(sender, instance, **kwargs):
-    MenuCategory.objects.filter(pk=instance.pk).update(
-        search_vector=SearchVector(models.F("name"), models.F("description"))
-    )
+@receiver([post_save, post_delete], sender=MenuCategory)
+def bump_menu_version_on_category_change(sender, instance, **kwargs):
+    if MenuCategory.outlet.is_cached(instance):
+        bump_menu_version(instance.outlet.slug)
+    else:
+        bump_menu_version_for_outlet_id(instance.outlet_id)
+
+@receiver([post_save, post_delete], sender=CategoryImage)
+def bump_menu_version_on_category_image_change(sender, instance, **kwargs):
+    outlet_ids = MenuCategory.objects.filter(image=instance).values_list("outlet_id", flat=True).distinct()
+    for outlet_id in outlet_ids:
+        bump_menu_version_for_outlet_id(outlet_id)
+
+@receiver(post_delete, sender=Outlet)
+def bump_menu_version_on_outlet_delete(sender, instance, **kwargs):
+    bump_menu_version(instance.slug)
     
 offer_title_choices = [
     ('discount', 'Discount'),
@@ -68,9 +97,10 @@ class MenuItem(TimeStampedModel):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     is_available = models.BooleanField(default=True)
     image = models.ImageField(upload_to='menu_items/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True)  # see core.utils.images.ingest_image
     display_order = models.PositiveIntegerField(default=0)
     slug = models.SlugField(unique=True, null=True, blank=True)
-    search_vector = SearchVectorField(blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True)  # maintained by a DB trigger (migration 0003)
     likes = models.PositiveIntegerField(default=0)
     special_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     offers = models.ManyToManyField('Menu.Offers', related_name='menu_items', blank=True)
@@ -79,28 +109,128 @@ class MenuItem(TimeStampedModel):
         if not self.slug:
             self.slug = generate_unique_hash()
         super(MenuItem, self).save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the index was built from, so saves that leave the
+        # description alone (price, availability, ...) skip the indexer.
+        if "description" in field_names:
+            instance._indexed_fingerprint = description_fingerprint(instance.description)
+        return instance
     
     def __str__(self):
         return self.name
     
     class Meta:
         indexes = [
-            GinIndex(fields=["search_vector"])  # ✅ GIN index for fast search
+            GinIndex(fields=["search_vector"]),  # ✅ GIN index for fast search
+            GinIndex(fields=["name"], name="menu_item_name_trgm", opclasses=["gin_trgm_ops"]),  # typo-tolerant fallback
         ]
-        
+
+@receiver([post_save, post_delete], sender=MenuItem)
+def bump_menu_version_on_item_change(sender, instance, **kwargs):
+    # On cascaded deletes the category is already gone; its own signal bumps the outlet.
+    outlet_slug = MenuCategory.objects.filter(pk=instance.category_id).values_list("outlet__slug", flat=True).first()
+    if outlet_slug:
+        bump_menu_version(outlet_slug)
+
 @receiver(post_save, sender=MenuItem)
-def update_menu_item_vector_signal(sender, instance, **kwargs):
-    MenuItem.objects.filter(pk=instance.pk).update(
-        search_vector=SearchVector(models.F("name"), models.F("description"))
+def generate_menu_item_embedding_signal(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and "description" not in update_fields:
+        return
+    if "description" in instance.get_deferred_fields():
+        return
+    fingerprint = description_fingerprint(instance.description)
+    if not created and getattr(instance, "_indexed_fingerprint", None) == fingerprint:
+        return  # Description unchanged, nothing to re-embed
+    instance._indexed_fingerprint = fingerprint
+    outlet_slug = MenuCategory.objects.filter(pk=instance.category_id).values_list("outlet__slug", flat=True).first()
+    if outlet_slug:
+        schedule_menu_item_index(outlet_slug, instance.slug)
+
+@receiver(post_delete, sender=MenuItem)
+def remove_menu_item_embedding_signal(sender, instance, **kwargs):
+    # On cascaded deletes the outlet may be gone too; its points are then left to the reindex command.
+    outlet_slug = MenuCategory.objects.filter(pk=instance.category_id).values_list("outlet__slug", flat=True).first()
+    if outlet_slug:
+        schedule_menu_item_index(outlet_slug, instance.slug)
+
+class AIJob(TimeStampedModel):
+    """
+    A long-running AI task (e.g. image generation) executed by a Celery worker.
+    The API enqueues the job and returns its slug; clients poll its status.
+    """
+    KIND_CHOICES = (
+        ('menu_item_image', 'Menu Item Image'),
+        ('category_image', 'Category Image'),
+        ('description_enhancement', 'Description Enhancement'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('applied', 'Applied'),  # reviewed results written back (description enhancement)
+    )
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    outlet = models.ForeignKey('core.Outlet', on_delete=models.CASCADE, related_name='ai_jobs')
+    target_slug = models.SlugField(help_text="Slug of the menu item, category or outlet the job works on")
+    params = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(null=True, blank=True)
+    slug = models.SlugField(unique=True, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["outlet", "kind", "target_slug"], name="ai_job_target_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = generate_unique_hash()
+        super(AIJob, self).save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.kind} {self.target_slug} ({self.status})"
+
+
+class UploadSession(TimeStampedModel):
+    """
+    A direct-to-storage image upload. The client PUTs the file to a pre-signed
+    URL for `object_name`, then completes the session; an `images` worker checks
+    the object and ingests it into the target, so no image bytes pass through
+    the API. Objects of abandoned sessions are left to the bucket's lifecycle
+    rule expiring the uploads/ prefix (see UPLOAD_SESSION_EXPIRY_SECONDS in settings).
+    """
+    TARGET_CHOICES = (
+        ('menu_item_image', 'Menu Item Image'),
+        ('outlet_cover_image', 'Outlet Cover Image'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),  # URL issued, waiting for the client's upload
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
     )
+    target = models.CharField(max_length=30, choices=TARGET_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    outlet = models.ForeignKey('core.Outlet', on_delete=models.CASCADE, related_name='upload_sessions')
+    target_slug = models.SlugField(help_text="Slug of the menu item or outlet the image is for")
+    object_name = models.CharField(max_length=255, unique=True)
+    content_type = models.CharField(max_length=50)
+    size = models.PositiveIntegerField()  # declared by the client and signed into the URL
+    expires_at = models.DateTimeField()
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(null=True, blank=True)
+    slug = models.SlugField(unique=True, null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = generate_unique_hash()
+        super(UploadSession, self).save(*args, **kwargs)
 
-@receiver(pre_save, sender=MenuItem)
-def generate_menu_item_embedding_signal(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old = MenuItem.objects.get(pk=instance.pk)
-            if old.name == instance.name and old.description == instance.description:
-                return  # No change, skip updating search_vector
-        except MenuItem.DoesNotExist:
-            pass  # New object, proceed to update
-    generate_menu_item_embedding_task.delay(name=instance.name, description=instance.description, slug=instance.slug, outlet_slug=instance.category.outlet.slug)
\ No newline at end of file
+    def __str__(self):
+        return f"{self.target} {self.target_slug} ({self.status})"
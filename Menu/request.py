@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 from pydantic import Field
 
 from fastapi import UploadFile
@@ -39,4 +39,16 @@ class ItemDisplayOrderObject(BaseModel):
     display_order: int
     
 class ItemRearrangementRequest(BaseModel):    
-    ordering: list[ItemDisplayOrderObject]
\ No newline at end of file
+    ordering: list[ItemDisplayOrderObject]
+
+class DescriptionEnhancementApplyRequest(BaseModel):
+    slugs: Optional[list[str]] = Field(None, description="Menu item slugs to apply; all proposed changes when omitted")
+
+class UploadSessionCreateRequest(BaseModel):
+    target: Literal["menu_item_image", "outlet_cover_image"]
+    target_slug: Optional[str] = Field(None, description="Menu item slug; omitted for the outlet cover image")
+    content_type: Literal["image/jpeg", "image/png", "image/gif", "image/webp", "image/avif"]
+    size: Annotated[int, Field(gt=0, description="Exact size of the file in bytes")]
+
+class UploadSessionsCreateRequest(BaseModel):
+    uploads: Annotated[list[UploadSessionCreateRequest], Field(min_length=1, max_length=100)]
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 from typing import Optional
 
@@ -33,18 +35,44 @@ class OutletObjects(BaseModel):
     last_seen_id: Optional[int] = None
     outlets: list[OutletObject]
 
+class AIJobObject(BaseModel):
+    slug: str
+    kind: str
+    status: str
+    progress: int
+    target_slug: str
+    result: dict
+    error: Optional[str] = None
+
+class UploadSessionObject(BaseModel):
+    slug: str
+    target: str
+    target_slug: str
+    status: str
+    expires_at: datetime
+    upload_url: Optional[str] = None  # only when the session is created
+    upload_headers: Optional[dict[str, str]] = None  # to send with the PUT
+    result: dict
+    error: Optional[str] = None
+
+class UploadSessionObjects(BaseModel):
+    sessions: list[UploadSessionObject]
+
 class MenuCategoryCreationResponse(BaseModel):
     name: str
     description: str
     is_active: bool
     slug: str
     image: Optional[str] = None
+    image_job: Optional[AIJobObject] = None
 
 class MenuCategoryObject(BaseModel):
     name: str
     description: str
     is_active: bool
     image: Optional[str] = None
+    image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    image_placeholder: Optional[str] = None  # blurred data URI
     slug: str
 
 class MenuCategoryObjects(BaseModel):
@@ -63,8 +91,11 @@ class MenuItemCreationResponse(BaseModel):
     price: float
     is_available: bool
     image: Optional[str] = None
+    image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    image_placeholder: Optional[str] = None  # blurred data URI
     slug: str
     category_slug: str
+    image_job: Optional[AIJobObject] = None
 
 class MenuItemObject(BaseModel):
     name: str
@@ -72,6 +103,8 @@ class MenuItemObject(BaseModel):
     price: float
     is_available: bool
     image: Optional[str] = None
+    image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    image_placeholder: Optional[str] = None  # blurred data URI
     slug: str
     category_slug: Optional[str] = None
 
@@ -85,6 +118,8 @@ class MenuItemUpdateResponse(BaseModel):
     price: float
     is_available: bool
     image: Optional[str] = None
+    image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    image_placeholder: Optional[str] = None  # blurred data URI
     slug: str
     category_slug: str
     
@@ -104,5 +139,11 @@ class OutletObjectsUser(BaseModel):
 class MenuItemObjectsUser(BaseModel):
     items: list[MenuItemObject]
     
+class ScoredMenuItemObject(MenuItemObject):
+    score: float
+
+class MenuItemsSearchResponse(BaseModel):
+    items: list[ScoredMenuItemObject]
+
 class MenuItemsContextualSearchResponse(BaseModel):
-    items: list[str]
\ No newline at end of file
+    items: list[ScoredMenuItemObject]
\ No newline at end of file
@@ -0,0 +1,70 @@
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Greatest
+
+from core.utils.asyncs import get_queryset
+
+# Must match the configuration used by the search_vector triggers (Menu migration 0003).
+SEARCH_CONFIG = "english"
+
+# Standard reciprocal rank fusion constant; dampens the advantage of the very top ranks.
+RRF_K = 60
+
+
+def _prefix_query(query: str) -> SearchQuery | None:
+    """
+    Turns "panee tik" into the tsquery `panee:* & tik:*`, so partially typed
+    words still match. Returns None if the query has no word characters.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config=SEARCH_CONFIG)
+
+
+async def ranked_search(queryset: QuerySet, query: str, limit: int | None) -> list:
+    """
+    Full-text search over a model with a weighted `search_vector` and a `name` column.
+
+    Matches are ordered by ts_rank (name hits outrank description hits). When
+    nothing matches, falls back to prefix matching and trigram similarity on the
+    name, which catches half-typed words and typos ("panner" -> "Paneer").
+    """
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    results = await get_queryset(
+        list,
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "display_order")[:limit],
+    )
+    if results:
+        return results
+
+    prefix_query = _prefix_query(query)
+    if prefix_query is None:
+        return []
+    fallback = (
+        queryset.annotate(
+            rank=SearchRank(F("search_vector"), prefix_query),
+            similarity=TrigramWordSimilarity(query, "name"),
+        )
+        .filter(Q(search_vector=prefix_query) | Q(similarity__gte=settings.MENU_SEARCH_TRIGRAM_THRESHOLD))
+        .order_by(Greatest("rank", "similarity").desc(), "display_order")[:limit]
+    )
+    return await get_queryset(list, fallback)
+
+
+def reciprocal_rank_fusion(*rankings: list[str], k: int = RRF_K) -> list[tuple[str, float]]:
+    """
+    Fuses ranked lists of slugs: each list contributes 1 / (k + rank) to every
+    slug it contains. Returns (slug, score) pairs, best first. Only ranks are
+    used, so lexical ts_rank values and vector cosine scores need no calibration.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, slug in enumerate(ranking, start=1):
+            scores[slug] = scores.get(slug, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
@@ -1,31 +1,60 @@
+import asyncio
+
 from .request import (
     CategoryRearrangementRequest,
     ItemRearrangementRequest,    
     MenuCategoryCreationRequest,
     MenuCategoryUpdateRequest,
     MenuItemCreationRequest,
-    MenuItemUpdateRequest
+    MenuItemUpdateRequest,
+    DescriptionEnhancementApplyRequest,
+    UploadSessionsCreateRequest
 )
 from .response import (
     MenuItemObjectsUser,
     MenuItemsContextualSearchResponse,
+    MenuItemsSearchResponse,
+    ScoredMenuItemObject,
     MenuCategoryCreationResponse,
     MenuCategoryObject,
     MenuCategoryObjects,
     MenuCategoryUpdateResponse,
+    AIJobObject,
     MenuItemCreationResponse,
     MenuItemObject,
     MenuItemObjects,
-    MenuItemUpdateResponse    
+    MenuItemUpdateResponse,
+    UploadSessionObject,
+    UploadSessionObjects
 )
 from core.models import Franchise, Outlet, OutletSliderImage
-from .models import  MenuCategory, MenuItem, CategoryImage
+from .models import  MenuCategory, MenuItem, CategoryImage, AIJob, UploadSession
+from .jobs import apply_description_enhancement, enqueue_ai_job
+from .tasks import ingest_uploaded_image_task
+from .uploads import upload_object_name
+from .image_cache import aget_cached_image
 from fastapi import HTTPException, status
 from core.utils.asyncs import get_related_object, get_queryset
 from .utils import enhance_menu_item_description_with_ai, return_matching_menu_items, generate_menu_category_image
-from django.contrib.postgres.search import SearchQuery
+from .cache import MenuSnapshot, abump_menu_version, get_menu_version, read_menu_snapshot, write_menu_snapshot
+from core.schema import BaseResponse
+from core.utils.responses import encode_variants
+from .search import ranked_search, reciprocal_rank_fusion
+from core.utils.logger import logger
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Prefetch
+from core.utils.images import InvalidImageError, adelete_image, adelete_replaced_image, aingest_image, responsive_image
+from core.utils.storage import direct_uploads_supported, presigned_put_url, run_storage_io
+from datetime import timedelta
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from dishto.GlobalUtils import generate_unique_hash
+
+
+def category_image_fields(image: CategoryImage | None) -> dict:
+    return responsive_image(image.image if image else None, image.image_variants if image else None)
+
 
 class MenuService:
     async def create_menu_category(self, body: MenuCategoryCreationRequest, outlet) -> MenuCategoryCreationResponse:
@@ -35,26 +64,24 @@ class MenuService:
                 outlet=outlet,
                 description=body.description
             )
-            # generte image for the category
-            image = None
-            # try:
-            #     image = await CategoryImage.objects.aget(category_name=category.name)
-            # except CategoryImage.DoesNotExist:
-            #     # Generate image using AI
-            #     image_content = await generate_menu_category_image(category.name)
-            #     if image_content:
-            #         image = await CategoryImage.objects.acreate(
-            #             category_name=category.name,
-            #             image=image_content
-            #         )
-            #         category.image = image
-            await category.asave()
+            # Category images are shared platform-wide by normalized name; only
+            # names no outlet has used before are generated, in the background
+            image = await aget_cached_image("category", category.name)
+            image_job = None
+            if image:
+                category.image = image
+                await category.asave(update_fields=["image", "updated_at"])
+            else:
+                image_job = self._ai_job_object(
+                    await enqueue_ai_job("category_image", outlet, category.slug)
+                )
             return MenuCategoryCreationResponse(
                 name=category.name,
                 description=category.description,
                 is_active=category.is_active,
                 slug=category.slug,
-                image=image.image.url if image else None
+                image=image.image.url if image else None,
+                image_job=image_job
             )        
         except Exception as e:
             raise HTTPException(
@@ -79,13 +106,12 @@ class MenuService:
                 categories_objs = []
                 for c in categories:
                     img_obj = await get_related_object(c, "image")
-                    image_url = img_obj.image.url if img_obj else None
                     categories_objs.append(
                         MenuCategoryObject(
                             name=c.name,
                             description=c.description or "",
                             is_active=c.is_active,
-                            image=image_url,
+                            **category_image_fields(img_obj),
                             slug=c.slug
                         )
                     )
@@ -97,12 +123,11 @@ class MenuService:
                 try:
                     category = await MenuCategory.objects.aget(slug=slug, outlet=outlet)
                     img_obj = await get_related_object(category, "image")
-                    image_url = img_obj.image.url if img_obj else None
                     return MenuCategoryObject(
                         name=category.name,
                         description=category.description or "",
                         is_active=category.is_active,
-                        image=image_url,
+                        **category_image_fields(img_obj),
                         slug=category.slug
                     )
                 except MenuCategory.DoesNotExist:
@@ -118,13 +143,8 @@ class MenuService:
     
     async def search_menu_categories(self, outlet, query: str, limit: int | None) -> MenuCategoryObjects:
         try:            
-            # Perform search using the search vector
-            queryset = MenuCategory.objects.filter(
-                outlet=outlet,
-                search_vector=SearchQuery(query)
-            ).order_by("display_order")[:limit]
-            
-            categories = await get_queryset(list, queryset)
+            # Ranked full-text search with prefix/trigram fallback
+            categories = await ranked_search(MenuCategory.objects.filter(outlet=outlet), query, limit)
             if not categories:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -140,6 +160,8 @@ class MenuService:
                         ) for c in categories
                     ]
                 )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -213,6 +235,7 @@ class MenuService:
                 category.display_order = mapping[category.slug]
 
             await MenuCategory.objects.abulk_update(categories, ["display_order"])
+            await abump_menu_version(outlet.slug)
 
             # Return in new display order
             categories = sorted(categories, key=lambda c: c.display_order)
@@ -234,9 +257,9 @@ class MenuService:
         
         
     
-    async def create_menu_item(self, body: MenuItemCreationRequest, image_file=None) -> MenuItemCreationResponse:
+    async def create_menu_item(self, body: MenuItemCreationRequest, outlet, image_file=None) -> MenuItemCreationResponse:
         try:
-            category = await MenuCategory.objects.aget(slug=body.category_slug)
+            category = await MenuCategory.objects.aget(slug=body.category_slug, outlet=outlet)
             # Create menu item
             item = await MenuItem.objects.acreate(
                 name=body.name,
@@ -247,25 +270,21 @@ class MenuService:
             )
             
             # Handle image upload if provided
-            image_url = None
-            if image_file:                                
-                # Generate filename using item slug
-                file_extension="png"
-                unique_filename = f"{item.slug}.{file_extension}"
-                
-                image_file.name = unique_filename  # Set the name for the ContentFile            
-                
-                # Save the file to the model
-                item.image.save(unique_filename, image_file, save=False)
-                await item.asave()
-                image_url = item.image.url if item.image else None
+            if image_file:
+                # Stored as a resized WebP original plus responsive variants, named after the item
+                try:
+                    item.image_variants = await aingest_image(item.image, image_file, item.slug)
+                except InvalidImageError:
+                    await item.adelete()
+                    raise
+                await item.asave(update_fields=["image", "image_variants", "updated_at"])
             
             return MenuItemCreationResponse(
                 name=item.name,
                 description=item.description or "",
                 price=float(item.price),
                 is_available=item.is_available,
-                image=image_url,
+                **responsive_image(item.image, item.image_variants),
                 slug=item.slug,
                 category_slug=category.slug
             )
@@ -274,6 +293,11 @@ class MenuService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Menu category not found."
             )
+        except InvalidImageError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -305,7 +329,7 @@ class MenuService:
                             description=item.description or "",
                             price=float(item.price),
                             is_available=item.is_available,
-                            image=item.image.url if item.image else None,
+                            **responsive_image(item.image, item.image_variants),
                             slug=item.slug,
                             category_slug=category.slug
                         ) for item in items
@@ -319,7 +343,7 @@ class MenuService:
                         description=item.description or "",
                         price=float(item.price),
                         is_available=item.is_available,
-                        image=item.image.url if item.image else None,
+                        **responsive_image(item.image, item.image_variants),
                         slug=item.slug,
                         category_slug=category.slug
                     )
@@ -350,19 +374,21 @@ class MenuService:
                 item.is_available = body.is_available
             
             # Handle image upload if provided
+            previous_image, previous_variants = item.image.name, item.image_variants
             if image_file:
-                # image_file is already a Django ContentFile, so we can save it directly
-                item.image.save(image_file.name, image_file, save=False)
+                item.image_variants = await aingest_image(item.image, image_file, item.slug)
             
             # Save the item
             await item.asave()
+            if image_file:
+                await adelete_replaced_image(item.image, previous_image, previous_variants)
             
             return MenuItemUpdateResponse(
                 name=item.name,
                 description=item.description or "",
                 price=float(item.price),
                 is_available=item.is_available,
-                image=item.image.url if item.image else None,
+                **responsive_image(item.image, item.image_variants),
                 slug=item.slug,
                 category_slug=category.slug
             )
@@ -376,6 +402,11 @@ class MenuService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Menu item not found."
             )
+        except InvalidImageError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -390,10 +421,10 @@ class MenuService:
             
             item = await MenuItem.objects.aget(slug=slug, category=category)
             
-            # Delete the image file if it exists
+            # Delete the image file and its variants if they exist
             if item.image:
                 try:
-                    item.image.delete(save=False)
+                    await adelete_image(item.image, item.image_variants)
                 except:
                     pass  # Continue even if image deletion fails
             
@@ -449,7 +480,7 @@ class MenuService:
         
         return await enhance_menu_item_description_with_ai(item_name, description)
     
-    async def rearrange_menu_item_display_order(self, body: ItemRearrangementRequest, category_slug: str) -> MenuItemObjects:
+    async def rearrange_menu_item_display_order(self, body: ItemRearrangementRequest, category_slug: str, outlet) -> MenuItemObjects:
         try:
             category = await MenuCategory.objects.aget(slug=category_slug)
             mapping = {obj.menu_item_slug: obj.display_order for obj in body.ordering}
@@ -470,6 +501,7 @@ class MenuService:
                 item.display_order = mapping[item.slug]
 
             await MenuItem.objects.abulk_update(items, ["display_order"])
+            await abump_menu_version(outlet.slug)
 
             # Return in new display order
             items = sorted(items, key=lambda i: i.display_order)
@@ -480,7 +512,7 @@ class MenuService:
                         description=i.description or "",
                         price=float(i.price),
                         is_available=i.is_available,
-                        image=i.image.url if i.image else None,
+                        **responsive_image(i.image, i.image_variants),
                         slug=i.slug,
                         category_slug=category.slug
                     ) for i in items
@@ -502,17 +534,18 @@ class MenuService:
                 detail=f"Failed to update menu item display order: {str(e)}"
             )
             
-    async def search_menu_items(self, category_slug: str, query: str, limit: int | None) -> MenuItemObjects:
+    async def search_menu_items(self, outlet, query: str, limit: int | None, category_slug: str | None = None) -> MenuItemObjects:
+        """
+        Searches the menu items of an outlet, optionally restricted to one category.
+        Results are ranked, and fall back to prefix/trigram matching when nothing matches exactly.
+        """
         try:
-            category = await MenuCategory.objects.aget(slug=category_slug)
-            
-            # Perform search using the search vector
-            queryset = MenuItem.objects.filter(
-                category=category,
-                search_vector=SearchQuery(query)
-            ).order_by("display_order")[:limit]
-            
-            items = await get_queryset(list, queryset)
+            queryset = MenuItem.objects.filter(category__outlet=outlet).select_related("category")
+            if category_slug:
+                category = await MenuCategory.objects.aget(slug=category_slug, outlet=outlet)
+                queryset = queryset.filter(category=category)
+
+            items = await ranked_search(queryset, query, limit)
             if not items:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -525,9 +558,9 @@ class MenuService:
                         description=i.description or "",
                         price=float(i.price),
                         is_available=i.is_available,
-                        image=i.image.url if i.image else None,
+                        **responsive_image(i.image, i.image_variants),
                         slug=i.slug,
-                        category_slug=category.slug
+                        category_slug=i.category.slug
                     ) for i in items
                 ]
             )
@@ -536,11 +569,6 @@ class MenuService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Menu category not found."
             )
-        except Outlet.DoesNotExist:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Outlet not found."
-            )
     
     async def get_menu_categories_for_outlet(
         self,
@@ -559,7 +587,6 @@ class MenuService:
                 .select_related("image")
                 .order_by("display_order")
             ):
-                image_url = c.image.image.url if c.image else None
                 last_seen_order = c.display_order
 
                 categories_objs.append(
@@ -567,7 +594,7 @@ class MenuService:
                         name=c.name,
                         description=c.description or "",
                         is_active=c.is_active,
-                        image=image_url,
+                        **category_image_fields(c.image),
                         slug=c.slug
                     )
                 )
@@ -611,7 +638,7 @@ class MenuService:
                         description=item.description or "",
                         price=float(item.price),
                         is_available=item.is_available,
-                        image=item.image.url if item.image else None,
+                        **responsive_image(item.image, item.image_variants),
                         slug=item.slug,
                         category_slug=item.category.slug
                     )
@@ -630,6 +657,35 @@ class MenuService:
                 detail=f"Failed to retrieve menu for outlet: {str(e)}"
             )
 
+    async def get_menu_snapshot_for_outlet(
+        self,
+        franchise,
+        outlet_slug: str,
+        encoding: str = "identity",
+        version: int | None = None
+    ) -> MenuSnapshot:
+        """
+        Returns the public menu of an outlet as pre-serialized response bytes.
+        Snapshots are cached per outlet and menu version, so a hit costs one
+        Redis round trip and no database or Pydantic work. The version is bumped
+        by the MenuItem/MenuCategory signals whenever the menu changes; callers
+        that already read it (e.g. for an ETag) pass it in.
+        """
+        if version is None:
+            version = await get_menu_version(outlet_slug)
+        if version is not None:
+            body = await read_menu_snapshot(outlet_slug, version, franchise.id, encoding)
+            if body is not None:
+                return MenuSnapshot(version=version, body=body, encoding=encoding)
+
+        menu = await self.get_menu_for_outlet(franchise=franchise, outlet_slug=outlet_slug)
+        variants = encode_variants(
+            BaseResponse[MenuItemObjectsUser](data=menu).model_dump_json(by_alias=True).encode()
+        )
+        if version is not None:
+            await write_menu_snapshot(outlet_slug, version, franchise.id, variants)
+        return MenuSnapshot(version=version, body=variants[encoding], encoding=encoding)
+
             
     async def get_menu_items_for_category(
         self,
@@ -660,7 +716,7 @@ class MenuService:
                             description=item.description or "",
                             price=float(item.price),
                             is_available=item.is_available,
-                            image=item.image.url if item.image else None,
+                            **responsive_image(item.image, item.image_variants),
                             slug=item.slug
                         )
                     )
@@ -679,7 +735,7 @@ class MenuService:
                     description=item.description or "",
                     price=float(item.price),
                     is_available=item.is_available,
-                    image=item.image.url if item.image else None,
+                    **responsive_image(item.image, item.image_variants),
                     slug=item.slug
                 )
 
@@ -705,28 +761,369 @@ class MenuService:
             )
 
             
-    async def search_menu_items_contextually(self, outlet_slug:str, query: str) -> MenuItemsContextualSearchResponse:
-        try:            
+    async def _scored_menu_items(self, queryset, scored: list[tuple[str, float]], known: dict | None = None) -> list[ScoredMenuItemObject]:
+        """
+        Turns ranked (slug, score) pairs into ScoredMenuItemObjects, loading the
+        items not already in `known` with one query. Slugs without an item (vector
+        hits can outlive their item until the indexer catches up) are dropped.
+        """
+        items = dict(known or {})
+        missing = [slug for slug, _ in scored if slug not in items]
+        if missing:
+            async for item in queryset.filter(slug__in=missing):
+                items[item.slug] = item
+        return [
+            ScoredMenuItemObject(
+                name=item.name,
+                description=item.description or "",
+                price=float(item.price),
+                is_available=item.is_available,
+                **responsive_image(item.image, item.image_variants),
+                slug=item.slug,
+                category_slug=item.category.slug,
+                score=score
+            )
+            for slug, score in scored
+            if (item := items.get(slug)) is not None
+        ]
+
+    async def search_menu_items_contextually(
+        self,
+        franchise,
+        outlet_slug: str,
+        query: str,
+        limit: int = 10
+    ) -> MenuItemsContextualSearchResponse:
+        """
+        Semantic search over an outlet's menu item descriptions. Qdrant returns the
+        best matching chunk of each item above MENU_CONTEXTUAL_SEARCH_THRESHOLD; the
+        items are hydrated in one query and returned with their similarity score.
+        """
+        try:
+            outlet = await franchise.outlet_set.aget(slug=outlet_slug)
             # search directly in qdrant
             results = await return_matching_menu_items(
                 query=query,
-                outlet_slug=outlet_slug,
-                limit=10
+                outlet_slug=outlet.slug,
+                limit=limit,
+                threshold=settings.MENU_CONTEXTUAL_SEARCH_THRESHOLD
             )
             if not results:
                 return MenuItemsContextualSearchResponse(items=[])
-            seen = set()
-            unique_slugs = []
-            for item in results:
-                slug = item['slug']
-                if slug not in seen:
-                    seen.add(slug)
-                    unique_slugs.append(slug)
-            return MenuItemsContextualSearchResponse(
-                items=unique_slugs
+            items = await self._scored_menu_items(
+                MenuItem.objects.filter(category__outlet=outlet).select_related("category"),
+                [(hit["slug"], hit["score"]) for hit in results],
+            )
+            return MenuItemsContextualSearchResponse(items=items)
+        except Outlet.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Outlet not found."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to search menu items: {str(e)}"
+            )
+
+    async def hybrid_search_menu_items(
+        self,
+        franchise,
+        outlet_slug: str,
+        query: str,
+        limit: int = 10
+    ) -> MenuItemsSearchResponse:
+        """
+        Searches an outlet's menu with Postgres full-text search and Qdrant vector
+        search at the same time, and fuses both rankings with reciprocal rank fusion.
+        Exact name matches and "something light and spicy" style queries both land
+        near the top. If the vector side fails, lexical results are still returned.
+        """
+        try:
+            outlet = await franchise.outlet_set.aget(slug=outlet_slug)
+            candidates = settings.MENU_HYBRID_SEARCH_CANDIDATES
+            queryset = MenuItem.objects.filter(category__outlet=outlet).select_related("category")
+
+            lexical, vector = await asyncio.gather(
+                ranked_search(queryset, query, candidates),
+                return_matching_menu_items(query=query, outlet_slug=outlet.slug, limit=candidates, threshold=None),
+                return_exceptions=True,
+            )
+            if isinstance(lexical, BaseException):
+                raise lexical
+            if isinstance(vector, BaseException):
+                logger.warning(f"Vector search failed for outlet '{outlet.slug}', using lexical results only: {vector}")
+                vector = []
+
+            fused = reciprocal_rank_fusion(
+                [item.slug for item in lexical], [hit["slug"] for hit in vector]
+            )[:limit]
+            if not fused:
+                return MenuItemsSearchResponse(items=[])
+            return MenuItemsSearchResponse(
+                items=await self._scored_menu_items(queryset, fused, known={item.slug: item for item in lexical})
+            )
+        except Outlet.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Outlet not found."
             )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to search menu items: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _ai_job_object(job: AIJob) -> AIJobObject:
+        return AIJobObject(
+            slug=job.slug,
+            kind=job.kind,
+            status=job.status,
+            progress=job.progress,
+            target_slug=job.target_slug,
+            result=job.result,
+            error=job.error
+        )
+
+    async def enqueue_menu_item_image(self, category_slug: str, slug: str, outlet, fresh: bool = False) -> AIJobObject:
+        """
+        Queues Gemini image generation for a menu item; the worker stores the
+        image on the item when done. Poll the returned job for its status.
+        Unless `fresh` is set, an image already generated for the same food
+        name is reused.
+        """
+        try:
+            item = await MenuItem.objects.aget(slug=slug, category__slug=category_slug, category__outlet=outlet)
+            job = await enqueue_ai_job("menu_item_image", outlet, item.slug, params={"fresh": fresh})
+            return self._ai_job_object(job)
+        except MenuItem.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Menu item not found."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to queue image generation: {str(e)}"
+            )
+
+    async def enqueue_menu_category_image(self, slug: str, outlet) -> AIJobObject:
+        """
+        Queues Gemini image generation for a menu category. Poll the returned job for its status.
+        """
+        try:
+            category = await MenuCategory.objects.aget(slug=slug, outlet=outlet)
+            job = await enqueue_ai_job("category_image", outlet, category.slug)
+            return self._ai_job_object(job)
+        except MenuCategory.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Menu category not found."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to queue image generation: {str(e)}"
+            )
+
+    async def get_ai_job(self, slug: str, outlet) -> AIJobObject:
+        try:
+            job = await AIJob.objects.aget(slug=slug, outlet=outlet)
+            return self._ai_job_object(job)
+        except AIJob.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found."
+            )
+
+    async def enqueue_description_enhancement(self, outlet, category_slug: str | None = None) -> AIJobObject:
+        """
+        Queues AI enhancement of every item description in the outlet (or one
+        category). The finished job holds a before/after diff; nothing changes
+        until it is applied.
+        """
+        try:
+            target_slug = outlet.slug
+            if category_slug:
+                category = await MenuCategory.objects.aget(slug=category_slug, outlet=outlet)
+                target_slug = category.slug
+            job = await enqueue_ai_job(
+                "description_enhancement", outlet, target_slug, params={"category_slug": category_slug}
+            )
+            return self._ai_job_object(job)
+        except MenuCategory.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Menu category not found."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to queue description enhancement: {str(e)}"
+            )
+
+    async def apply_description_enhancement(self, slug: str, body: DescriptionEnhancementApplyRequest, outlet) -> AIJobObject:
+        try:
+            job = await AIJob.objects.select_related("outlet").aget(
+                slug=slug, outlet=outlet, kind="description_enhancement"
+            )
+            if job.status != "succeeded":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Job is {job.status}; only finished jobs can be applied."
+                )
+            await get_queryset(apply_description_enhancement, job, body.slugs)
+            return self._ai_job_object(job)
+        except HTTPException:
+            raise
+        except AIJob.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to apply description enhancement: {str(e)}"
+            )
+
+    @staticmethod
+    def _upload_session_object(session: UploadSession, upload_url: str | None = None) -> UploadSessionObject:
+        return UploadSessionObject(
+            slug=session.slug,
+            target=session.target,
+            target_slug=session.target_slug,
+            status=session.status,
+            expires_at=session.expires_at,
+            upload_url=upload_url,
+            upload_headers={"Content-Type": session.content_type} if upload_url else None,
+            result=session.result,
+            error=session.error
+        )
+
+    async def create_upload_sessions(self, body: UploadSessionsCreateRequest, outlet) -> UploadSessionObjects:
+        """
+        Issues a pre-signed PUT URL per image, for clients to upload straight to
+        the media bucket (bulk menu photo uploads never pass through the API).
+        Each URL only accepts the declared content type and size.
+        """
+        if not direct_uploads_supported():
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Direct uploads need the S3 storage backend; use the multipart upload endpoints."
+            )
+        try:
+            max_size = settings.MAX_IMAGE_UPLOAD_SIZE
+            too_large = [i + 1 for i, upload in enumerate(body.uploads) if upload.size > max_size]
+            if too_large:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Upload(s) {', '.join(map(str, too_large))} too large. Maximum size is {max_size // (1024 * 1024)}MB."
+                )
+            item_slugs = {upload.target_slug for upload in body.uploads if upload.target == "menu_item_image"}
+            found = set(await get_queryset(
+                list,
+                MenuItem.objects.filter(slug__in=item_slugs, category__outlet=outlet).values_list("slug", flat=True)
+            ))
+            if item_slugs - found:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Menu item(s) not found: {', '.join(sorted(str(slug) for slug in item_slugs - found))}"
+                )
+
+            expires_in = settings.UPLOAD_SESSION_EXPIRY_SECONDS
+            expires_at = timezone.now() + timedelta(seconds=expires_in)
+            sessions = [
+                UploadSession(
+                    slug=generate_unique_hash(),  # bulk_create skips save()
+                    target=upload.target,
+                    outlet=outlet,
+                    target_slug=upload.target_slug if upload.target == "menu_item_image" else outlet.slug,
+                    object_name=upload_object_name(outlet.slug),
+                    content_type=upload.content_type,
+                    size=upload.size,
+                    expires_at=expires_at,
+                )
+                for upload in body.uploads
+            ]
+            await UploadSession.objects.abulk_create(sessions)
+            return UploadSessionObjects(sessions=[
+                self._upload_session_object(
+                    session,
+                    presigned_put_url(session.object_name, session.content_type, session.size, expires_in),
+                )
+                for session in sessions
+            ])
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create upload sessions: {str(e)}"
+            )
+
+    async def complete_upload_session(self, slug: str, outlet) -> UploadSessionObject:
+        """
+        Called by the client once its PUT succeeded. Checks that the object is
+        in the bucket (a HEAD request; its bytes are never read here) and queues
+        verification and variant generation on the `images` worker.
+        """
+        try:
+            session = await UploadSession.objects.aget(slug=slug, outlet=outlet)
+            if session.status != "pending":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload session is {session.status}."
+                )
+            if not await run_storage_io(default_storage.exists, session.object_name):
+                if session.expires_at < timezone.now():
+                    raise HTTPException(
+                        status_code=status.HTTP_410_GONE,
+                        detail="Upload session expired; create a new one."
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The file has not been uploaded yet."
+                )
+            # Guards against completing the same session twice concurrently
+            claimed = await UploadSession.objects.filter(pk=session.pk, status="pending").aupdate(
+                status="processing", updated_at=timezone.now()
+            )
+            if not claimed:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload session is already being processed."
+                )
+            try:
+                ingest_uploaded_image_task.delay(session.slug)
+            except Exception:
+                # Nothing was queued, so hand the session back for the client to retry
+                await UploadSession.objects.filter(pk=session.pk, status="processing").aupdate(
+                    status="pending", updated_at=timezone.now()
+                )
+                raise
+            session.status = "processing"
+            return self._upload_session_object(session)
+        except HTTPException:
+            raise
+        except UploadSession.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to complete upload session: {str(e)}"
+            )
+
+    async def get_upload_session(self, slug: str, outlet) -> UploadSessionObject:
+        try:
+            session = await UploadSession.objects.aget(slug=slug, outlet=outlet)
+            return self._upload_session_object(session)
+        except UploadSession.DoesNotExist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found."
+            )
@@ -1,8 +1,64 @@
-from celery import shared_task
-import asyncio
-from .utils import generate_menu_item_embedding
+from celery import Task, shared_task
+from core.utils.asyncs import run_async
+from core.utils.logger import logger
+from .indexer import drain_pending, index_menu_items, requeue
+from .jobs import run_ai_job
+from .uploads import fail_upload_session, process_upload_session
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def flush_menu_index_task(self, outlet_slug: str, item_slugs: list[str] | None = None):
+    """
+    Indexes every menu item queued for an outlet (plus `item_slugs`, if given)
+    with batched embedding calls and a single Qdrant upsert.
+    """
+    slugs = sorted(set(drain_pending(outlet_slug)) | set(item_slugs or []))
+    if not slugs:
+        return 0
+    logger.info(f"Indexing {len(slugs)} menu items of {outlet_slug}")
+    try:
+        return run_async(index_menu_items(outlet_slug, slugs))
+    except Exception as exc:
+        requeue(outlet_slug, slugs)
+        raise self.retry(exc=exc)
+
+
+@shared_task
+def generate_image_task(job_slug: str):
+    """
+    Runs an image generation AIJob. Routed to the `images` queue, so slow
+    generations never hold up embedding work.
+    """
+    logger.info(f"Running image generation job {job_slug}")
+    run_ai_job(job_slug)
+
 
 @shared_task
-def generate_menu_item_embedding_task(name: str, description: str, outlet_slug: str, slug:str):
-    print("running generate_menu_item_embedding_task")
-    asyncio.run(generate_menu_item_embedding(name=name, description=description, slug=slug, outlet_slug=outlet_slug))
+def enhance_descriptions_task(job_slug: str):
+    """
+    Runs a bulk description enhancement AIJob, producing a diff for review.
+    """
+    logger.info(f"Running description enhancement job {job_slug}")
+    run_ai_job(job_slug)
+
+
+class UploadIngestionTask(Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        # Called once the retries are used up
+        fail_upload_session(args[0], str(exc))
+
+
+@shared_task(
+    base=UploadIngestionTask,
+    autoretry_for=(Exception,),  # invalid images are settled without raising
+    retry_backoff=10,
+    retry_kwargs={"max_retries": 5},
+)
+def ingest_uploaded_image_task(session_slug: str):
+    """
+    Verifies and ingests an image uploaded directly to storage through an
+    UploadSession. Routed to the `images` queue with the other image work;
+    storage or database hiccups are retried with backoff.
+    """
+    logger.info(f"Ingesting direct upload {session_slug}")
+    process_upload_session(session_slug)
@@ -0,0 +1,79 @@
+import uuid
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from core.models import Outlet
+from core.utils.images import InvalidImageError, delete_replaced_image, ingest_image
+from core.utils.logger import logger
+from core.utils.uploads import SNIFF_BYTES, sniff_image_type
+from .models import MenuItem, UploadSession
+
+
+def upload_object_name(outlet_slug: str) -> str:
+    # Random, so a pre-signed URL can never overwrite a stored image
+    return f"uploads/{outlet_slug}/{uuid.uuid4().hex}"
+
+
+def _ingest_menu_item_image(session: UploadSession, source) -> dict:
+    try:
+        item = MenuItem.objects.get(slug=session.target_slug, category__outlet_id=session.outlet_id)
+    except MenuItem.DoesNotExist:
+        raise InvalidImageError("The menu item no longer exists.")
+    previous_image, previous_variants = item.image.name, item.image_variants
+    item.image_variants = ingest_image(item.image, source, item.slug)
+    # Only the image changed, so the embedding signal skips re-indexing
+    item.save(update_fields=["image", "image_variants", "updated_at"])
+    delete_replaced_image(item.image, previous_image, previous_variants)
+    return {"image": item.image.url}
+
+
+def _ingest_outlet_cover_image(session: UploadSession, source) -> dict:
+    outlet = Outlet.objects.get(id=session.outlet_id)
+    previous_image, previous_variants = outlet.cover_image.name, outlet.cover_image_variants
+    outlet.cover_image_variants = ingest_image(outlet.cover_image, source, outlet.slug)
+    outlet.save(update_fields=["cover_image", "cover_image_variants", "updated_at"])
+    delete_replaced_image(outlet.cover_image, previous_image, previous_variants)
+    return {"image": outlet.cover_image.url}
+
+
+UPLOAD_TARGETS = {
+    "menu_item_image": _ingest_menu_item_image,
+    "outlet_cover_image": _ingest_outlet_cover_image,
+}
+
+
+def process_upload_session(session_slug: str) -> None:
+    """
+    Checks a completed upload's magic bytes and ingests it into its target
+    (resized original plus variants, as for multipart uploads), then deletes
+    the raw upload. Any other error leaves the session processing and the
+    upload in place, for the task to retry. Blocking; runs in the `images` worker.
+    """
+    session = UploadSession.objects.get(slug=session_slug)
+    if session.status != "processing":
+        return  # redelivered after it already finished
+    try:
+        with default_storage.open(session.object_name, "rb") as source:
+            if sniff_image_type(source.read(SNIFF_BYTES)) is None:
+                raise InvalidImageError("The uploaded file is not a JPEG, PNG, GIF, WebP or AVIF image.")
+            session.result = UPLOAD_TARGETS[session.target](session, source)
+        session.status = "completed"
+    except InvalidImageError as e:
+        session.status, session.error = "failed", str(e)
+    session.save(update_fields=["status", "result", "error", "updated_at"])
+    try:
+        default_storage.delete(session.object_name)
+    except Exception as e:
+        # The session is settled; the bucket lifecycle rule removes the object later
+        logger.warning(f"Failed to delete upload {session.object_name}: {e}")
+
+
+def fail_upload_session(session_slug: str, error: str) -> None:
+    """
+    Gives up on a session whose ingestion kept failing. The upload stays in the
+    bucket until the lifecycle rule removes it.
+    """
+    UploadSession.objects.filter(slug=session_slug, status="processing").update(
+        status="failed", error=error, updated_at=timezone.now()
+    )
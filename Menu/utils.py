@@ -1,8 +1,8 @@
-import os
 import uuid
 import mimetypes
 import asyncio
-from google import genai
+import json
+import time
 from google.genai import types
 from django.core.files.base import ContentFile
 from core.utils.constants import (
@@ -10,19 +10,24 @@ from core.utils.constants import (
     IMAGE_GEN_MODEL_GEMINI,
     DESCRIPTION_ENHANCEMENT_MODEL_GEMINI,
     MENU_ITEM_DESCRIPTION_ENHANCEMENT_SYSTEM_PROMPT,
-    GEMINI_EMBEDDINGS_MODEL,
+    MENU_ITEMS_BULK_DESCRIPTION_ENHANCEMENT_SYSTEM_PROMPT,
     MENUITEM_COLLECTION_NAME,
     MENU_CATEGORY_IMAGE_GENRATION_PROMPT
 )
 from anyio import to_thread  # Use anyio for FastAPI compatibility
-from dishto.GlobalUtils import genai_client, qdrant_client_
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
+from core.utils.clients import get_async_qdrant_client, get_genai_client
+from core.utils.logger import logger
+from qdrant_client.models import Filter, FieldCondition, MatchValue
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from .embeddings import embed_query
+from .collection import menu_item_search_params
 import base64
 
 GEMINI_IMAGE_SEMAPHORE = asyncio.Semaphore(9)
 
-GEMINI_DESCRIPTION_SEMAPHORE = asyncio.Semaphore(29)
+# Concurrent description calls allowed per process; bulk jobs size their thread pools from it
+GEMINI_DESCRIPTION_CONCURRENCY = 29
+GEMINI_DESCRIPTION_SEMAPHORE = asyncio.Semaphore(GEMINI_DESCRIPTION_CONCURRENCY)
 
 menu_item_description_splitter = RecursiveCharacterTextSplitter(
         chunk_size=150,
@@ -33,7 +38,7 @@ menu_item_description_splitter = RecursiveCharacterTextSplitter(
 def _blocking_gemini_image(
     food_name: str, description: str, prompt: str, model: str, generate_content_config
 ) -> ContentFile:
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+    client = get_genai_client()
     contents = [
         types.Content(role="user", parts=[types.Part.from_text(text=prompt)]),
         types.Content(
@@ -71,44 +76,67 @@ def _blocking_gemini_image(
     raise RuntimeError("No image data returned from Gemini.")
 
 
-async def generate_menu_item_image(
+IMAGE_GENERATION_CONFIG = types.GenerateContentConfig(
+    temperature=2,
+    top_p=1,
+    response_modalities=["IMAGE", "TEXT"],
+    response_mime_type="text/plain",
+)
+
+
+def _generate_image_with_retries(
+    name: str, description: str, prompt: str, max_retries: int, delay: float
+) -> ContentFile:
+    last_exception = None
+    for attempt in range(1, max_retries + 1):
+        try:
+            return _blocking_gemini_image(
+                name, description, prompt, IMAGE_GEN_MODEL_GEMINI, IMAGE_GENERATION_CONFIG
+            )
+        except Exception as e:
+            last_exception = e
+            logger.warning(f"Gemini image attempt {attempt} for '{name}' failed: {e}")
+        if attempt < max_retries:
+            time.sleep(delay)
+    raise RuntimeError(
+        f"Failed to generate image from Gemini after {max_retries} attempts. Last error: {last_exception}"
+    )
+
+
+def generate_menu_item_image_sync(
     food_name: str, description: str, max_retries: int = 3, delay: float = 2.0
 ) -> ContentFile:
     """
     Generates a photorealistic menu item image using Gemini and returns a Django ContentFile.
-    Runs the blocking Gemini call in a thread to avoid blocking the event loop.
-    Retries on failure.
+    Blocks for the whole generation; meant for Celery workers. Retries on failure.
     """
-    model = IMAGE_GEN_MODEL_GEMINI
-    prompt = MENU_ITEM_IMAGE_GENRATION_PROMPT
-    generate_content_config = types.GenerateContentConfig(
-        temperature=2,
-        top_p=1,
-        response_modalities=["IMAGE", "TEXT"],
-        response_mime_type="text/plain",
+    return _generate_image_with_retries(
+        food_name, description, MENU_ITEM_IMAGE_GENRATION_PROMPT, max_retries, delay
     )
 
-    last_exception = None
+
+def generate_menu_category_image_sync(
+    category_name: str, max_retries: int = 3, delay: float = 2.0
+) -> ContentFile:
+    """
+    Generates a photorealistic menu category image using Gemini and returns a Django ContentFile.
+    Blocks for the whole generation; meant for Celery workers. Retries on failure.
+    """
+    prompt = MENU_CATEGORY_IMAGE_GENRATION_PROMPT.format(category_name=category_name)
+    return _generate_image_with_retries(category_name, category_name, prompt, max_retries, delay)
+
+
+async def generate_menu_item_image(
+    food_name: str, description: str, max_retries: int = 3, delay: float = 2.0
+) -> ContentFile:
+    """
+    Async variant of generate_menu_item_image_sync; runs it in a thread.
+    Prefer queueing an image AIJob from request handlers.
+    """
     async with GEMINI_IMAGE_SEMAPHORE:
-        for attempt in range(1, max_retries + 1):
-            try:
-                result = await to_thread.run_sync(
-                    _blocking_gemini_image,
-                    description,
-                    food_name,
-                    prompt,
-                    model,
-                    generate_content_config,
-                )
-                return result
-            except Exception as e:
-                last_exception = e
-                print(f"[Gemini] Attempt {attempt} failed: {e}")
-            if attempt < max_retries:
-                await asyncio.sleep(delay)
-    raise RuntimeError(
-        f"Failed to generate image from Gemini after {max_retries} attempts. Last error: {last_exception}"
-    )
+        return await to_thread.run_sync(
+            generate_menu_item_image_sync, food_name, description, max_retries, delay
+        )
 
 
 def _blocking_gemini_enhance_description(client, model, contents, config):
@@ -144,7 +172,7 @@ async def enhance_menu_item_description_with_ai(
             try:
                 response_text = await to_thread.run_sync(
                     _blocking_gemini_enhance_description,
-                    genai_client,
+                    get_genai_client(),
                     model,
                     contents,
                     config,
@@ -160,34 +188,68 @@ async def enhance_menu_item_description_with_ai(
     )
 
 
-async def generate_embeddings(
-    contents: list[str], model: str = GEMINI_EMBEDDINGS_MODEL
-) -> list[float]:
+def enhance_menu_item_descriptions_sync(
+    items: list[tuple[str, str]], max_retries: int = 3, delay: float = 2.0
+) -> list[str | None]:
     """
-    Generates embeddings for the given contents using the specified model.
-    Returns a list of embeddings.
+    Enhances several (name, description) pairs with a single Gemini call.
+    Returns the enhanced descriptions in input order; None where the model
+    skipped an item. Blocking; meant for Celery workers. Retries on failure.
     """
-    response = genai_client.models.embed_content(model=model, contents=contents)
-
-    if not response.embeddings:
-        raise ValueError("No embeddings returned from Gemini.")
+    prompt = "\n".join(
+        json.dumps({"id": i, "name": name, "description": description})
+        for i, (name, description) in enumerate(items)
+    )
+    contents = [
+        types.Content(role="user", parts=[types.Part.from_text(text=prompt)]),
+    ]
+    config = types.GenerateContentConfig(
+        system_instruction=MENU_ITEMS_BULK_DESCRIPTION_ENHANCEMENT_SYSTEM_PROMPT,
+        temperature=1,
+        response_mime_type="application/json",
+    )
 
-    return [embedding.values for embedding in response.embeddings]
+    last_exception = None
+    for attempt in range(1, max_retries + 1):
+        try:
+            response_text = _blocking_gemini_enhance_description(
+                get_genai_client(), DESCRIPTION_ENHANCEMENT_MODEL_GEMINI, contents, config
+            )
+            enhanced = {
+                entry["id"]: entry["description"].strip()
+                for entry in json.loads(response_text)
+                if isinstance(entry.get("id"), int) and entry.get("description")
+            }
+            return [enhanced.get(i) for i in range(len(items))]
+        except Exception as e:
+            last_exception = e
+            logger.warning(f"Gemini bulk description enhancement attempt {attempt} failed: {e}")
+            if attempt < max_retries:
+                time.sleep(delay)
+    raise RuntimeError(
+        f"Failed to enhance descriptions from Gemini after {max_retries} attempts. Last error: {last_exception}"
+    )
 
 
 async def return_matching_menu_items(
-    query: str, outlet_slug: str, limit: int = 10, threshold: float = 0.7
+    query: str, outlet_slug: str, limit: int = 10, threshold: float | None = 0.7
 ) -> list[dict]:
     """Returns a list of matching menu items based on the query and outlet slug.
     Uses the Qdrant vector database to find similar items.
+    Chunk hits are grouped per item in Qdrant, so each item appears once with the
+    payload and `score` of its best matching chunk, best first. Chunks scoring
+    below `threshold` are ignored; pass None to keep every hit.
     """
-    # Generate the query embedding
-    query_embedding = await generate_embeddings([query])
+    # Generate the query embedding (cached per normalized query and model)
+    query_embedding = await embed_query(query)
 
-    search_results = qdrant_client_.query_points(
+    search_results = await get_async_qdrant_client().query_points_groups(
         collection_name=MENUITEM_COLLECTION_NAME,
-        query=query_embedding[0],
+        query=query_embedding,
+        group_by="slug",
+        group_size=1,
         limit=limit,
+        score_threshold=threshold,
         query_filter=Filter(
             must=[
                 FieldCondition(
@@ -195,82 +257,24 @@ async def return_matching_menu_items(
                 ),
             ]
         ),
+        search_params=menu_item_search_params(),
         with_payload=True,
     )
-    return [point.payload for point in search_results.points]
-
-async def return_embeddings_given_chunks(
-    chunks: list[str], model: str = GEMINI_EMBEDDINGS_MODEL
-) -> list[list[float]]:
-    """
-    Generates embeddings for a list of text chunks using the specified model.
-    Returns a list of embeddings, one for each chunk.
-    """
-    if not chunks:
-        return []
-
-    # Generate embeddings for all chunks
-    embeddings = await generate_embeddings(chunks, model=model)
-    
-    return embeddings
-
-async def generate_menu_item_embedding(
-    name: str, description: str, slug: str, outlet_slug: str
-) -> None:
-    # New approach will use multiple embedding chunks for this
-    chunks = menu_item_description_splitter.split_text(description)
-
-    embeddings = await return_embeddings_given_chunks(chunks)
-    if not embeddings:return
-    points = []
-    for i, embedding in enumerate(embeddings):
-        point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{slug}_{i}"))
-        point = PointStruct(
-            id=point_id,
-            vector=embedding,
-            payload={"slug": slug, "outlet_slug": outlet_slug}
-        )
-        points.append(point)
-    # insert it into qdrant
-    qdrant_client_.upsert(collection_name=MENUITEM_COLLECTION_NAME, points=points)
+    return [
+        {**group.hits[0].payload, "score": group.hits[0].score}
+        for group in search_results.groups
+        if group.hits
+    ]
 
 
 async def generate_menu_category_image(
     category_name: str, max_retries: int = 3, delay: float = 2.0
 ) -> ContentFile:
     """
-    Generates a photorealistic menu category image using Gemini and returns a Django ContentFile.
-    Runs the blocking Gemini call in a thread to avoid blocking the event loop.
-    Retries on failure.
+    Async variant of generate_menu_category_image_sync; runs it in a thread.
+    Prefer queueing an image AIJob from request handlers.
     """
-    prompt = MENU_CATEGORY_IMAGE_GENRATION_PROMPT.format(category_name=category_name)
-    
-    model = IMAGE_GEN_MODEL_GEMINI
-    generate_content_config = types.GenerateContentConfig(
-        temperature=2,
-        top_p=1,
-        response_modalities=["IMAGE", "TEXT"],
-        response_mime_type="text/plain",
-    )
-
-    last_exception = None
     async with GEMINI_IMAGE_SEMAPHORE:
-        for attempt in range(1, max_retries + 1):
-            try:
-                result = await to_thread.run_sync(
-                    _blocking_gemini_image,
-                    category_name,
-                    category_name,
-                    prompt,
-                    model,
-                    generate_content_config,
-                )
-                return result
-            except Exception as e:
-                last_exception = e
-                print(f"[Gemini] Category image attempt {attempt} failed: {e}")
-            if attempt < max_retries:
-                await asyncio.sleep(delay)
-    raise RuntimeError(
-        f"Failed to generate category image from Gemini after {max_retries} attempts. Last error: {last_exception}"
-    )
+        return await to_thread.run_sync(
+            generate_menu_category_image_sync, category_name, max_retries, delay
+        )
@@ -24,10 +24,14 @@ from .request import (
     MenuItemUpdateRequest,
     CategoryRearrangementRequest,
     ItemRearrangementRequest,
+    DescriptionEnhancementApplyRequest,
+    UploadSessionsCreateRequest,
 )
 from .response import (    
+    AIJobObject,
     MenuItemObjectsUser,
-    MenuItemsContextualSearchResponse,    
+    MenuItemsContextualSearchResponse,
+    MenuItemsSearchResponse,
     MenuCategoryCreationResponse,
     MenuCategoryObject,
     MenuCategoryObjects,
@@ -35,15 +39,27 @@ from .response import (
     MenuItemCreationResponse,
     MenuItemObject,
     MenuItemObjects,
-    MenuItemUpdateResponse,    
+    MenuItemUpdateResponse,
+    UploadSessionObject,
+    UploadSessionObjects,
 )
 from .service import MenuService
 from .models import MenuCategory, MenuItem, CategoryImage
-from django.core.files.base import ContentFile
 from core.dependencies import is_superadmin, require_feature # CHANGED: from has_feature to require_feature
 from core.dependencies import franchise_exists, is_franchise_admin, is_outlet_admin
-from .utils import generate_menu_item_image
 from core.utils.limiters import limiter
+from core.utils.uploads import open_image_upload, upload_size
+from core.utils.images import InvalidImageError, adelete_replaced_image, aingest_image, responsive_image
+from core.utils.responses import (
+    cache_headers,
+    encoded_json_response,
+    is_not_modified,
+    make_etag,
+    model_json_response,
+    negotiate_encoding,
+    not_modified_response,
+)
+from .cache import get_menu_version
 from slowapi.util import get_remote_address
 from fastapi import Form, UploadFile, File
 from core.views import end_user_router
@@ -61,9 +77,32 @@ async def get_menu_categories_for_outlet(
     outlet_slug: str = Path(..., description="Slug of the outlet"),
     service: MenuService = Depends(MenuService),
 ) -> BaseResponse[MenuCategoryObjects]:
+    franchise = request.state.franchise
+    etag = make_etag(request.url.path, franchise.slug, await get_menu_version(outlet_slug))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    data = await service.get_menu_categories_for_outlet(
+        franchise=franchise, outlet_slug=outlet_slug
+    )
+    return model_json_response(BaseResponse[MenuCategoryObjects](data=data), headers=cache_headers(etag))
+
+@end_user_router.get(
+    "/menu/{outlet_slug}/search",
+    summary="Search Menu Items",
+    description="""Search the menu items of an outlet by name, description and meaning. Full-text and vector results are fused into one ranking.""",
+    dependencies=[Depends(franchise_exists)]
+)
+@limiter.limit("50/minute")
+async def hybrid_search_menu_items(
+    request: Request,
+    outlet_slug: str = Path(..., description="Slug of the outlet"),
+    query: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of items to return"),
+    service: MenuService = Depends(MenuService),
+) -> BaseResponse[MenuItemsSearchResponse]:
     return BaseResponse(
-        data=await service.get_menu_categories_for_outlet(
-            franchise=request.state.franchise, outlet_slug=outlet_slug
+        data=await service.hybrid_search_menu_items(
+            franchise=request.state.franchise, outlet_slug=outlet_slug, query=query, limit=limit
         )
     )
 
@@ -77,12 +116,13 @@ async def get_menu_categories_for_outlet(
 async def search_menu_items_contextually(
     request: Request,
     outlet_slug: str = Path(..., description="Slug of the outlet"),
-    query: str = Query(..., description="Search query"),
+    query: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of items to return"),
     service: MenuService = Depends(MenuService),
 ) -> BaseResponse[MenuItemsContextualSearchResponse]:    
     return BaseResponse(
         data=await service.search_menu_items_contextually(
-            outlet_slug=outlet_slug, query=query
+            franchise=request.state.franchise, outlet_slug=outlet_slug, query=query, limit=limit
         )
     )
 
@@ -100,10 +140,15 @@ async def get_menu_items_for_category(
     slug: str = Path(..., description="Slug of the menu item"),
     service: MenuService = Depends(MenuService),
 ) -> BaseResponse[MenuItemObjectsUser | MenuItemObject]:
-    return BaseResponse(
-        data=await service.get_menu_items_for_category(
-            franchise=request.state.franchise, outlet_slug=outlet_slug, category_slug=category_slug, slug=slug
-        )
+    franchise = request.state.franchise
+    etag = make_etag(request.url.path, franchise.slug, await get_menu_version(outlet_slug))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    data = await service.get_menu_items_for_category(
+        franchise=franchise, outlet_slug=outlet_slug, category_slug=category_slug, slug=slug
+    )
+    return model_json_response(
+        BaseResponse[MenuItemObjectsUser | MenuItemObject](data=data), headers=cache_headers(etag)
     )
 
 @end_user_router.get(
@@ -118,11 +163,19 @@ async def get_menu_for_outlet(
     outlet_slug: str = Path(..., description="Slug of the outlet"),
     service: MenuService = Depends(MenuService),
 ) -> BaseResponse[MenuItemObjectsUser]:
-    return BaseResponse(
-        data=await service.get_menu_for_outlet(
-            franchise=request.state.franchise, outlet_slug=outlet_slug
-        )
-)
+    franchise = request.state.franchise
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    version = await get_menu_version(outlet_slug)
+    etag = make_etag(request.url.path, franchise.slug, version, encoding)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, headers={"Vary": "Accept-Encoding"})
+    snapshot = await service.get_menu_snapshot_for_outlet(
+        franchise=franchise,
+        outlet_slug=outlet_slug,
+        encoding=encoding,
+        version=version,
+    )
+    return encoded_json_response(snapshot.body, snapshot.encoding, headers=cache_headers(etag))
 
 # Admin router
 router = APIRouter(prefix="/menu", tags=["Menu"])
@@ -193,7 +246,7 @@ async def search_menu_categories(
     service: MenuService = Depends(MenuService),
     outlet: Outlet = Depends(is_outlet_admin),
     query: str = Query(
-        None, description="Search term to filter categories by name or description"
+        ..., min_length=1, description="Search term to filter categories by name or description"
     ),
     limit: Optional[int] = Query(10, description="Maximum number of items to return"),
 ) -> BaseResponse[MenuCategoryObjects]:
@@ -287,20 +340,8 @@ async def create_menu_item(
     service: MenuService = Depends(MenuService),
     outlet: Outlet = Depends(is_outlet_admin),
 ) -> BaseResponse[MenuItemCreationResponse]:
-    if not image.content_type or not image.content_type.startswith("image/"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image"
-        )
-
-    if image.size and image.size > 5 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image file too large. Maximum size is 5MB.",
-        )
-
-    file_content = await image.read()
-
-    django_file = ContentFile(file_content)
+    # Validated in place; the upload stays in its spooled temporary file
+    django_file = await open_image_upload(image)
     request_data = MenuItemCreationRequest(
         name=name,
         category_slug=category_slug,
@@ -319,7 +360,8 @@ async def create_menu_item(
     description="""
     Create a new menu item without image upload.
 
-    Generates a photorealistic image using Gemini based on the menu item name and description.
+    The item is created right away; a photorealistic image is then generated with Gemini
+    in the background. Poll `image_job` via the AI job status endpoint until it succeeds.
 
     Requires the user to be the admin of the outlet.
     """,
@@ -330,11 +372,195 @@ async def create_menu_item_no_image(
     service: MenuService = Depends(MenuService),
     outlet: Outlet = Depends(is_outlet_admin),
 ) -> BaseResponse[MenuItemCreationResponse]:
-    django_image = await generate_menu_item_image(
-        food_name=data.name, description=data.description
+    item = await service.create_menu_item(body=data, outlet=outlet)
+    item.image_job = await service.enqueue_menu_item_image(
+        category_slug=item.category_slug, slug=item.slug, outlet=outlet
     )
+    return BaseResponse(data=item)
+
+
+@router.post(
+    "/{outlet_slug}/items/{category_slug}/{slug}/generate-image",
+    summary="Generate Menu Item Image",
+    description="""
+    Queue AI image generation for an existing menu item.
+
+    Returns immediately with a job; poll the AI job status endpoint until it succeeds.
+    The generated image replaces the item's current image. Images are shared by food
+    name across outlets; pass `fresh=true` to generate a new one instead.
+
+    Requires the user to be the admin of the outlet.
+    """,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))],
+)
+async def generate_menu_item_image(
+    category_slug: str,
+    slug: str,
+    fresh: bool = Query(False, description="Generate a new image instead of reusing the shared one"),
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[AIJobObject]:
     return BaseResponse(
-        data=await service.create_menu_item(body=data, image_file=django_image, outlet=outlet) # Pass outlet to service
+        data=await service.enqueue_menu_item_image(category_slug=category_slug, slug=slug, outlet=outlet, fresh=fresh)
+    )
+
+
+@router.post(
+    "/{outlet_slug}/categories/{slug}/generate-image",
+    summary="Generate Menu Category Image",
+    description="""
+    Queue AI image generation for a menu category.
+
+    Returns immediately with a job; poll the AI job status endpoint until it succeeds.
+
+    Requires the user to be the admin of the outlet.
+    """,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))],
+)
+async def generate_menu_category_image(
+    slug: str,
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[AIJobObject]:
+    return BaseResponse(
+        data=await service.enqueue_menu_category_image(slug=slug, outlet=outlet)
+    )
+
+
+@router.post(
+    "/{outlet_slug}/items/enhance-descriptions",
+    summary="Bulk Enhance Menu Item Descriptions with AI",
+    description="""
+    Queue AI enhancement of every menu item description in the outlet, or in one category
+    when `category_slug` is given. Items are sent to Gemini several per prompt.
+
+    The finished job's `result.changes` lists each item's current and proposed description
+    for review; nothing is changed until the job is applied.
+
+    Requires the user to be the admin of the outlet.
+    """,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))],
+)
+async def enhance_menu_item_descriptions(
+    category_slug: Optional[str] = Query(None, description="Limit the job to one category"),
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[AIJobObject]:
+    return BaseResponse(
+        data=await service.enqueue_description_enhancement(outlet=outlet, category_slug=category_slug)
+    )
+
+
+@router.post(
+    "/{outlet_slug}/ai-jobs/{slug}/apply",
+    summary="Apply Bulk Description Enhancement",
+    description="""
+    Write the proposed descriptions of a finished bulk enhancement job back to the menu items,
+    optionally only for the listed `slugs`. Items edited since the job ran are skipped
+    (`result.skipped`).
+
+    Requires the user to be the admin of the outlet.
+    """,
+    dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))],
+)
+async def apply_description_enhancement(
+    slug: str,
+    body: DescriptionEnhancementApplyRequest,
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[AIJobObject]:
+    return BaseResponse(
+        data=await service.apply_description_enhancement(slug=slug, body=body, outlet=outlet)
+    )
+
+
+@router.get(
+    "/{outlet_slug}/ai-jobs/{slug}",
+    summary="Get AI Job Status",
+    description="""
+    Get the status and progress of a background AI job (e.g. image generation).
+
+    Requires the user to be the admin of the outlet.
+    """,
+    dependencies=[Depends(is_outlet_admin)],
+)
+async def get_ai_job(
+    slug: str,
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[AIJobObject]:
+    return BaseResponse(
+        data=await service.get_ai_job(slug=slug, outlet=outlet)
+    )
+
+
+@router.post(
+    "/{outlet_slug}/uploads",
+    summary="Create Direct Upload Sessions",
+    description="""
+    Get pre-signed URLs to upload menu item images (or the outlet cover image) straight
+    to storage, up to 100 per request. For each session, PUT the file to `upload_url`
+    with `upload_headers`, then call the session's `complete` endpoint.
+
+    Each URL accepts exactly the declared content type and size, and expires at `expires_at`.
+    Only available with the S3 storage backend (501 otherwise).
+
+    Requires the user to be the admin of the outlet.
+    """,
+    dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))],
+)
+async def create_upload_sessions(
+    body: UploadSessionsCreateRequest,
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[UploadSessionObjects]:
+    return BaseResponse(
+        data=await service.create_upload_sessions(body=body, outlet=outlet)
+    )
+
+
+@router.post(
+    "/{outlet_slug}/uploads/{slug}/complete",
+    summary="Complete Direct Upload",
+    status_code=status.HTTP_202_ACCEPTED,
+    description="""
+    Confirm that the file was uploaded. The image is then verified and resized in the
+    background; poll the upload session until it is `completed` or `failed`.
+
+    Requires the user to be the admin of the outlet.
+    """,
+    dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))],
+)
+async def complete_upload_session(
+    slug: str,
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[UploadSessionObject]:
+    return BaseResponse(
+        data=await service.complete_upload_session(slug=slug, outlet=outlet)
+    )
+
+
+@router.get(
+    "/{outlet_slug}/uploads/{slug}",
+    summary="Get Direct Upload Status",
+    description="""
+    Get the status of a direct upload session; `result.image` holds the image URL once completed.
+
+    Requires the user to be the admin of the outlet.
+    """,
+    dependencies=[Depends(is_outlet_admin)],
+)
+async def get_upload_session(
+    slug: str,
+    service: MenuService = Depends(MenuService),
+    outlet: Outlet = Depends(is_outlet_admin),
+) -> BaseResponse[UploadSessionObject]:
+    return BaseResponse(
+        data=await service.get_upload_session(slug=slug, outlet=outlet)
     )
 
 
@@ -423,20 +649,8 @@ async def update_menu_item(
     service: MenuService = Depends(MenuService),
     outlet: Outlet = Depends(is_outlet_admin),
 ) -> BaseResponse[MenuItemUpdateResponse]:
-    if not image.content_type or not image.content_type.startswith("image/"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image"
-        )
-
-    if image.size and image.size > 5 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image file too large. Maximum size is 5MB.",
-        )
-
-    file_content = await image.read()
-
-    django_file = ContentFile(file_content)
+    # An empty file keeps the current image
+    django_file = await open_image_upload(image) if await upload_size(image) else None
     request_data = MenuItemUpdateRequest(
         name=name, description=description, price=price, is_available=is_available
     )
@@ -446,7 +660,7 @@ async def update_menu_item(
             slug=slug,
             body=request_data,
             outlet=outlet,
-            image_file=image_file,
+            image_file=django_file,
         )
     )
 
@@ -523,46 +737,25 @@ async def upload_menu_item_image(
     file: UploadFile = File(..., description="Image file to upload"),
     outlet: Outlet = Depends(is_outlet_admin),
 ) -> BaseResponse[dict]:
-    # Validate image file
-    if not file.content_type or not file.content_type.startswith("image/"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image"
-        )
-
-    # Check file size (limit to 5MB)
-    if file.size and file.size > 5 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image file too large. Maximum size is 5MB.",
-        )
+    # Validate the image type and size without reading it into memory
+    django_file = await open_image_upload(file)
 
     try:
         category = await MenuCategory.objects.aget(slug=category_slug)
 
         item = await MenuItem.objects.aget(slug=slug, category=category)
 
-        # Read the file content
-        file_content = await file.read()
-
-        # Generate filename using item slug
-        file_extension = (
-            file.filename.split(".")[-1]
-            if file.filename and "." in file.filename
-            else "jpg"
-        )
-        unique_filename = f"{item.slug}.{file_extension}"
-
-        # Create Django ContentFile
-        django_file = ContentFile(file_content, name=unique_filename)
-
-        # Save the file to the model
-        item.image.save(unique_filename, django_file, save=False)
-        await item.asave()
+        # Stored as a resized WebP original plus responsive variants, named after the item
+        previous_image, previous_variants = item.image.name, item.image_variants
+        item.image_variants = await aingest_image(item.image, django_file, item.slug)
+        await item.asave(update_fields=["image", "image_variants", "updated_at"])
+        await adelete_replaced_image(item.image, previous_image, previous_variants)
 
         return BaseResponse(
             data={
                 "message": "Image uploaded successfully",
                 "image_url": item.image.url if item.image else None,
+                "image_srcset": responsive_image(item.image, item.image_variants)["image_srcset"],
             }
         )
     except MenuCategory.DoesNotExist:
@@ -573,6 +766,10 @@ async def upload_menu_item_image(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Menu item not found."
         )
+    except InvalidImageError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
 
 
 @router.post(
@@ -599,19 +796,20 @@ async def rearrange_menu_item_display_order(
     "/{outlet_slug}/items/search",
     summary="Search Menu Item",
     description="""
-    Search for a menu category by slug."
-    - ?query=search_term: Search term to filter categories by name or description.
+    Search the menu items of an outlet, ranked by relevance.
+    - ?query=search_term: Search term to filter items by name or description.
+    - ?category_slug=slug: Optionally restrict the search to one category.
     """,
     dependencies=[Depends(is_outlet_admin), Depends(require_feature("menu"))], # CHANGED
 )
 async def search_menu_items(
     service: MenuService = Depends(MenuService),
     outlet: Outlet = Depends(is_outlet_admin),
-    category_slug: str = Query(
-        ..., description="Slug of the category to search menu items in"
+    category_slug: Optional[str] = Query(
+        None, description="Slug of the category to search menu items in (all categories if omitted)"
     ),
     query: str = Query(
-        None, description="Search term to filter items by name or description"
+        ..., min_length=1, description="Search term to filter items by name or description"
     ),
     limit: Optional[int] = Query(10, description="Maximum number of items to return"),
 ) -> BaseResponse[MenuItemObjects]:
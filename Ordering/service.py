@@ -2,24 +2,27 @@ from .request import OrderCreateRequest
 from .response import OrderResponse, OrderItemResponse
 from .models import Order, OrderItem
 from Menu.models import MenuItem
-from Inventory.models import MenuItemIngredient, InventoryTransaction, Ingredient
+from Inventory.models import MenuItemIngredient
+from Inventory.ledger import StockLedger, InsufficientStockError
 from fastapi import HTTPException, status
-from core.utils.asyncs import get_related_object
+from collections import defaultdict
 from decimal import Decimal
 from asgiref.sync import sync_to_async
 from django.db import transaction
+from dishto.GlobalUtils import generate_unique_hash
 
 class OrderService:
-    async def create_order(self, body: OrderCreateRequest, outlet) -> OrderResponse:
+    async def create_order(self, body: OrderCreateRequest, outlet, inventory_enabled: bool | None = None) -> OrderResponse:
         try:
-            # Check if the outlet has the inventory feature enabled
-            has_inventory_feature = await outlet.features.filter(name="inventory").aexists()
+            # Check if the outlet has the inventory feature enabled, unless the caller already knows
+            if inventory_enabled is None:
+                inventory_enabled = await outlet.features.filter(name="inventory").aexists()
 
             # Calculate total amount and validate items
             total_amount = Decimal("0.00")
             order_items_details = []
-            menu_item_slugs = [item.item_slug for item in body.items]
-            menu_items_qs = MenuItem.objects.filter(slug__in=menu_item_slugs)
+            menu_item_slugs = {item.item_slug for item in body.items}
+            menu_items_qs = MenuItem.objects.filter(slug__in=menu_item_slugs, category__outlet=outlet)
             menu_items_map = {item.slug: item async for item in menu_items_qs}
 
             if len(menu_items_map) != len(menu_item_slugs):
@@ -38,7 +41,8 @@ class OrderService:
                     "price": item_price
                 })
 
-            # Wrap order, item creation, and inventory transaction in a sync transaction
+            # Wrap order, item creation, and inventory transaction in a sync transaction.
+            # The number of queries does not depend on the number of items or recipe lines.
             @sync_to_async
             def create_order_sync_with_inventory(current_outlet, items_details, inventory_enabled):
                 with transaction.atomic():
@@ -47,49 +51,46 @@ class OrderService:
                         total_amount=total_amount,
                         special_instructions=body.special_instructions,
                     )
-                    item_objs = []
-                    for oi_detail in items_details:
-                        order_item = OrderItem.objects.create(
-                            order=order, # Link order_item to the created order
+                    # bulk_create skips save(), so slugs are assigned here
+                    item_objs = OrderItem.objects.bulk_create([
+                        OrderItem(
                             item=oi_detail["menu_item"],
                             quantity=oi_detail["quantity"],
                             price=oi_detail["price"],
+                            slug=generate_unique_hash(),
                         )
-                        item_objs.append(order_item)
+                        for oi_detail in items_details
+                    ])
+                    order.order_items.add(*item_objs)
 
                     # Inventory transaction part - only if inventory is enabled
                     if inventory_enabled:
+                        ordered_quantities = defaultdict(int)
                         for oi_detail in items_details:
-                            menu_item = oi_detail["menu_item"]
-                            quantity_ordered = oi_detail["quantity"]
-                            # Get all MenuItemIngredient objects for this menu item
-                            menu_item_ingredients = list(MenuItemIngredient.objects.filter(menu_item=menu_item))
-                            for mii in menu_item_ingredients:
-                                ingredient = mii.ingredient
-                                # Total quantity used = ingredient quantity per item * number of items ordered
-                                total_ingredient_used = mii.quantity * quantity_ordered
-                                # Create InventoryTransaction (assume 'OUT' for usage)
-                                InventoryTransaction.objects.create(
-                                    ingredient=ingredient,
-                                    transaction_type='usage',
-                                    quantity=total_ingredient_used,
-                                    note=f"Used in order {order.slug}",
-                                    outlet=current_outlet
-                                )
-                                # Deduct from ingredient stock
-                                ingredient.current_stock -= total_ingredient_used
-                                ingredient.save()
+                            ordered_quantities[oi_detail["menu_item"].pk] += oi_detail["quantity"]
+
+                        # Total quantity used per ingredient across the whole order, from one recipe query
+                        ingredient_usage = defaultdict(Decimal)
+                        recipe_lines = MenuItemIngredient.objects.filter(
+                            menu_item_id__in=ordered_quantities
+                        ).values_list("menu_item_id", "ingredient_id", "quantity")
+                        for menu_item_id, ingredient_id, quantity in recipe_lines:
+                            ingredient_usage[ingredient_id] += quantity * ordered_quantities[menu_item_id]
+
+                        # One insert for the usage transactions, then one conditional UPDATE per ingredient
+                        transactions = StockLedger().record_usage(current_outlet, ingredient_usage, note=f"Used in order {order.slug}")
+                        if transactions:
+                            order.inventory_transactions.add(*transactions)
 
                     return order, item_objs
 
-            order, item_objs = await create_order_sync_with_inventory(outlet, order_items_details, has_inventory_feature)
+            order, item_objs = await create_order_sync_with_inventory(outlet, order_items_details, inventory_enabled)
 
             # Build response
             items = []
             for oi in item_objs:
-                menu_item = await get_related_object(oi, "item")
                 items.append(OrderItemResponse(
-                    item_slug=menu_item.slug,
+                    item_slug=oi.item.slug,
                     quantity=oi.quantity,
                     price=oi.price,
                     slug=oi.slug
@@ -107,6 +108,8 @@ class OrderService:
 
         except MenuItem.DoesNotExist:
             raise HTTPException(status_code=404, detail="Menu item not found")
+        except InsufficientStockError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             # Added more specific exception handling for better debugging
             if isinstance(e, HTTPException):
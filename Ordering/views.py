@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status
 from core.schema import BaseResponse
-from core.dependencies import is_outlet_admin, require_feature # CHANGED: from has_feature to require_feature
+from core.dependencies import is_outlet_admin, require_feature, get_outlet_auth_context, OutletAuthContext # CHANGED: from has_feature to require_feature
 from core.models import Outlet # ADDED: Import Outlet model
 from functools import partial # ADDED: Import partial
 from .request import OrderCreateRequest
@@ -29,5 +29,6 @@ async def create_order(
     body: OrderCreateRequest,
     service: OrderService = Depends(OrderService),
     outlet: Outlet = Depends(is_outlet_admin), # RESTORED: Keep `outlet` parameter for service call
+    auth_context: OutletAuthContext = Depends(get_outlet_auth_context),
 ) -> OrderResponse:
-    return await service.create_order(body=body, outlet=outlet)
\ No newline at end of file
+    return await service.create_order(body=body, outlet=outlet, inventory_enabled="inventory" in auth_context.features)
\ No newline at end of file
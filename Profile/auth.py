@@ -0,0 +1,90 @@
+import copy
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from core.cache import get_user_version, user_cache
+
+
+def password_version(user) -> str:
+    """
+    Short fingerprint of the user's password hash. It changes whenever the
+    password changes, so snapshots cached under an older value are never served.
+    """
+    return user.get_session_auth_hash()[:16]
+
+
+class DishtoTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Adds the password version and, if AUTH_EMBED_TOKEN_CLAIMS is enabled, the
+    user's role claims to issued tokens. Refreshed access tokens copy them from
+    the refresh token.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["pwv"] = password_version(user)
+        if settings.AUTH_EMBED_TOKEN_CLAIMS:
+            token["role"] = user.role
+            token["slug"] = user.slug
+            token["is_superuser"] = user.is_superuser
+            token["is_staff"] = user.is_staff
+        return token
+
+
+@dataclass(frozen=True)
+class TokenIdentity:
+    """
+    What the permission dependencies need to know about the caller.
+    Built from the token claims when they are embedded, otherwise from the user.
+    """
+    user_id: int
+    role: str | None
+    slug: str | None
+    is_superuser: bool
+    is_staff: bool
+    password_version: str | None = None
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "TokenIdentity | None":
+        if not settings.AUTH_EMBED_TOKEN_CLAIMS or "role" not in claims:
+            return None
+        return cls(
+            user_id=claims["user_id"],
+            role=claims["role"],
+            slug=claims.get("slug"),
+            is_superuser=claims.get("is_superuser", False),
+            is_staff=claims.get("is_staff", False),
+            password_version=claims.get("pwv"),
+        )
+
+    @classmethod
+    def from_user(cls, user, password_version: str | None = None) -> "TokenIdentity":
+        return cls(
+            user_id=user.pk,
+            role=user.role,
+            slug=user.slug,
+            is_superuser=user.is_superuser,
+            is_staff=user.is_staff,
+            password_version=password_version,
+        )
+
+
+async def get_cached_user(user_id: int, pwv: str | None = None):
+    """
+    Returns the user with id `user_id`, served from the short-lived user cache.
+    Entries carry the user's password version, so a token issued after a
+    password change never gets a snapshot taken before it.
+    Raises User.DoesNotExist like `aget`.
+    """
+    # Without Redis (version None) entries still expire after USER_CACHE_TTL
+    key = (user_id, await get_user_version(user_id))
+    found, entry = user_cache.get(key)
+    if found and entry is not None and (pwv is None or entry[0] == pwv):
+        return copy.copy(entry[1])
+    user = await get_user_model().objects.aget(id=user_id)
+    user_cache.set(key, (password_version(user), user))
+    return copy.copy(user)
@@ -3,6 +3,9 @@ from django.contrib.auth.models import User,AbstractUser
 from .managers import CustomUserManager
 from django.utils.translation import gettext_lazy as _
 from dishto.GlobalUtils import generate_unique_hash,normalize_email
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.cache import invalidate_user
 
 
 # Create your models here.
@@ -35,4 +38,9 @@ class Profile(AbstractUser):
         if not self.forgot_password_code:
             self.forgot_password_code = generate_unique_hash()
         self.email = normalize_email(self.email)
-        super(Profile, self).save(*args, **kwargs)
\ No newline at end of file
+        super(Profile, self).save(*args, **kwargs)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
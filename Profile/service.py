@@ -1,5 +1,5 @@
 import django
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework.exceptions import AuthenticationFailed
 from fastapi import HTTPException, status
 from core.models import Franchise, Outlet
@@ -27,10 +27,11 @@ from .response import (
 import traceback
 from core.models import User
 from core.utils.asyncs import get_related_object
+from .auth import DishtoTokenObtainPairSerializer
 
 class AuthService:
     async def obtain_token(self,body: TokenRequest):
-        serializer = TokenObtainPairSerializer(data=body)
+        serializer = DishtoTokenObtainPairSerializer(data=body)
         try:
             if await is_valid_async(serializer):
                 access = serializer.validated_data['access']
@@ -22,7 +22,7 @@ from .response import (
     UserInfoResponse
 )
 
-from core.dependencies import is_superadmin, is_franchise_admin
+from core.dependencies import is_superadmin, is_franchise_admin, get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -116,9 +116,9 @@ async def refresh_token(request: Request, service: AuthService = Depends(AuthSer
 @router.get("/user-info")
 async def get_user_info(
     request: Request,
+    user = Depends(get_current_user),
     service: UserInfoService = Depends(UserInfoService)
 ) -> BaseResponse[UserInfoResponse]:    
-        user = request.state.user
         return BaseResponse(data = await service.get_user_info(user))
 
 @router.post("/set-password")
@@ -133,21 +133,23 @@ async def set_password(
 async def update_password(
     request: Request,
     data: UpdatePasswordRequest,
+    user = Depends(get_current_user),
     service: AuthService = Depends(AuthService),    
 ) -> BaseResponse[UpdatePasswordResponse]:
-    if not request.state.user:
+    if not user:
         return BaseResponse(status_code=401, message="Authentication credentials were not provided.")    
-    return BaseResponse(data=await service.update_password(body=data, user=request.state.user))
+    return BaseResponse(data=await service.update_password(body=data, user=user))
 
 @router.post("/update-profile")
 async def update_profile(
     request: Request,
     data: UpdateProfileRequest,
+    user = Depends(get_current_user),
     service: AuthService = Depends(AuthService),    
 ) -> BaseResponse[UpdateProfileResponse]:
-    if not request.state.user:
+    if not user:
         return BaseResponse(status_code=401, message="Authentication credentials were not provided.")    
-    return BaseResponse(data=await service.update_profile(body=data, user=request.state.user))
+    return BaseResponse(data=await service.update_profile(body=data, user=user))
 
 @router.post("/admin/franchise", dependencies=[Depends(is_superadmin)])
 async def create_franchise_admin(data: FranchiseAdminCreationRequest, service: AdminCreation = Depends(AdminCreation)) -> BaseResponse[FranchiseAdminCreationResponse]:
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.db import transaction
+
+from core.utils.cache import LocalTTLCache, bump_content_version, get_content_version
+
+# Franchise resolution for FranchiseMiddleware, keyed by (("subdomain"|"slug", value),
+# version). Unknown subdomains are cached as negative entries so bot traffic on
+# random subdomains does not reach Postgres. Franchise changes bump the franchises
+# content version in Redis, which retires the entries of every worker.
+franchise_cache = LocalTTLCache(
+    "franchises",
+    maxsize=settings.FRANCHISE_CACHE_MAXSIZE,
+    ttl=settings.FRANCHISE_CACHE_TTL,
+    negative_ttl=settings.FRANCHISE_NEGATIVE_CACHE_TTL,
+)
+
+# Authenticated users for AuthMiddleware, keyed by (user_id, version) and holding
+# (password_version, user). Profile saves and deletes bump the user's content
+# version in Redis, which retires the entries of every worker.
+user_cache = LocalTTLCache(
+    "users",
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL,
+)
+
+# Authorization context of protected outlet routes, keyed by (franchise_id,
+# outlet_slug, version). Outlet and OutletFeature changes bump the franchise's
+# outlet_auth content version in Redis, which retires the entries of every worker.
+outlet_auth_cache = LocalTTLCache(
+    "outlet_auth",
+    maxsize=settings.OUTLET_AUTH_CACHE_MAXSIZE,
+    ttl=settings.OUTLET_AUTH_CACHE_TTL,
+    negative_ttl=settings.OUTLET_AUTH_NEGATIVE_CACHE_TTL,
+)
+
+
+FRANCHISES_SCOPE = "franchises"
+
+
+def invalidate_franchises() -> None:
+    """
+    Retires the cached franchise lookups of all workers once the surrounding
+    transaction commits. Every entry goes, as the subdomain itself may have changed.
+    """
+    transaction.on_commit(lambda: bump_content_version(FRANCHISES_SCOPE))
+
+
+async def get_franchises_version() -> int | None:
+    return await get_content_version(FRANCHISES_SCOPE)
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def invalidate_user(user_id: int | None) -> None:
+    """
+    Retires the cached snapshots of a user in all workers once the surrounding
+    transaction commits, so deactivation or revoked roles apply everywhere.
+    """
+    if user_id is None:
+        return
+    transaction.on_commit(lambda: bump_content_version(user_scope(user_id)))
+
+
+async def get_user_version(user_id: int) -> int | None:
+    return await get_content_version(user_scope(user_id))
+
+
+def outlet_auth_scope(franchise_id: int) -> str:
+    return f"outlet_auth:{franchise_id}"
+
+
+def invalidate_outlet_auth(franchise_id: int | None) -> None:
+    """
+    Retires the cached authorization contexts of a franchise's outlets in all
+    workers once the surrounding transaction commits.
+    """
+    if franchise_id is None:
+        return
+    transaction.on_commit(lambda: bump_content_version(outlet_auth_scope(franchise_id)))
+
+
+async def get_outlet_auth_version(franchise_id: int) -> int | None:
+    return await get_content_version(outlet_auth_scope(franchise_id))
+
+
+def outlets_scope(franchise_id: int) -> str:
+    return f"outlets:{franchise_id}"
+
+
+def bump_outlets_version(franchise_id: int | None) -> None:
+    """
+    Invalidates the public outlet listing of a franchise once the surrounding
+    transaction commits.
+    """
+    if franchise_id is None:
+        return
+    transaction.on_commit(lambda: bump_content_version(outlets_scope(franchise_id)))
+
+
+async def get_outlets_version(franchise_id: int) -> int | None:
+    return await get_content_version(outlets_scope(franchise_id))
@@ -1,22 +1,44 @@
+import copy
+from dataclasses import dataclass, replace
+
 from fastapi import Depends, HTTPException, Request, status, Path
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.backends import TokenBackend
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken, TokenBackendError
 from django.conf import settings
-from core.utils.asyncs import get_related_object
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Q, Value
 from core.models import Outlet
+from core.cache import get_outlet_auth_version, outlet_auth_cache
+from Profile.auth import get_cached_user
 
 User = get_user_model()
 
+async def get_current_user(request: Request):
+    """
+    Dependency returning the authenticated user, or None.
+    When the token carries embedded claims, AuthMiddleware skips loading the
+    user, so it is loaded here (through the user cache) on first use.
+    """
+    user = getattr(request.state, "user", None)
+    identity = getattr(request.state, "identity", None)
+    if user is None and identity is not None:
+        try:
+            user = await get_cached_user(identity.user_id, identity.password_version)
+        except User.DoesNotExist:
+            raise HTTPException(status_code=401, detail="User not found")
+        request.state.user = user
+    return user
+
 async def is_superadmin(request: Request):
     """
     Dependency to check if the user is a superadmin.
     Raises HTTPException if the user is not a superadmin.
     """    
-    user = request.state.user
-    if not user:
+    identity = getattr(request.state, "identity", None)
+    if not identity:
         raise HTTPException(status_code=401, detail="Authentication credentials were not provided.")
-    if not user.is_superuser and not user.is_staff:
+    if not identity.is_superuser and not identity.is_staff:
         raise HTTPException(status_code=403, detail="You do not have permission to perform this action.")
     
     
@@ -26,39 +48,70 @@ async def is_franchise_admin(request: Request):
     Dependency to check if the user is a franchise admin.
     Raises HTTPException if the user is not a franchise admin.
     """
-    user = getattr(request.state, "user", None)
+    identity = getattr(request.state, "identity", None)
     franchise = getattr(request.state, "franchise", None)
-    if not user:
+    if not identity:
         raise HTTPException(status_code=401, detail="Authentication credentials were not provided.")
     if not franchise:
         raise HTTPException(status_code=404, detail="Franchise not found.")
-    admin = await get_related_object(franchise, "admin")
-    if user.role != "franchise_owner" and admin != user:
+    if identity.role != "franchise_owner" and franchise.admin_id != identity.user_id:
         raise HTTPException(status_code=403, detail="You do not have permission to perform this action.")
     return request.state.franchise
 
-async def is_outlet_admin(request: Request, outlet_slug: str = Path(...)):    
+@dataclass(frozen=True)
+class OutletAuthContext:
     """
-    Dependency to check if the user is an outlet admin.
-    Raises HTTPException if the user is not an outlet admin.
+    Everything the outlet-level permission checks need, loaded with one query.
     """
-    user = getattr(request.state, "user", None)
-    franchise = getattr(request.state, "franchise", None)    
-    if not user:
+    outlet: Outlet
+    admin_id: int | None
+    features: frozenset[str]
+
+
+async def load_outlet_auth_context(franchise_id: int, outlet_slug: str) -> OutletAuthContext | None:
+    # Without Redis (version None) entries still expire after OUTLET_AUTH_CACHE_TTL
+    key = (franchise_id, outlet_slug, await get_outlet_auth_version(franchise_id))
+    found, context = outlet_auth_cache.get(key)
+    if not found:
+        outlet = await Outlet.objects.filter(franchise_id=franchise_id, slug=outlet_slug).annotate(
+            feature_names=ArrayAgg("features__name", filter=Q(features__isnull=False), default=Value([]))
+        ).afirst()
+        context = None
+        if outlet is not None:
+            context = OutletAuthContext(outlet=outlet, admin_id=outlet.admin_id, features=frozenset(outlet.feature_names))
+        outlet_auth_cache.set(key, context)
+    if context is None:
+        return None
+    # Handlers may modify and save the outlet, so never hand out the cached instance.
+    return replace(context, outlet=copy.copy(context.outlet))
+
+async def get_outlet_auth_context(request: Request, outlet_slug: str = Path(...)) -> OutletAuthContext:
+    """
+    Dependency resolving the outlet of the current route with its admin and enabled features.
+    FastAPI caches it per request, so is_outlet_admin and require_feature share one lookup.
+    """
+    if not getattr(request.state, "identity", None):
         raise HTTPException(status_code=401, detail="Authentication credentials were not provided.")
+    franchise = getattr(request.state, "franchise", None)
     if not franchise:
         raise HTTPException(status_code=404, detail="Franchise not found.")
-    try:
-        outlet = await franchise.outlet_set.aget(slug=outlet_slug)
-        admin = await get_related_object(outlet, "admin")
-        if user.role != "outlet_owner" and admin != user:
-            raise HTTPException(status_code=403, detail="You do not have permission to perform this action.")   
-    except Outlet.DoesNotExist:
+    context = await load_outlet_auth_context(franchise.pk, outlet_slug)
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Outlet not found."
         )
-    return outlet
+    return context
+
+async def is_outlet_admin(request: Request, context: OutletAuthContext = Depends(get_outlet_auth_context)):    
+    """
+    Dependency to check if the user is an outlet admin.
+    Raises HTTPException if the user is not an outlet admin.
+    """
+    identity = request.state.identity
+    if identity.role != "outlet_owner" and context.admin_id != identity.user_id:
+        raise HTTPException(status_code=403, detail="You do not have permission to perform this action.")   
+    return context.outlet
 
 def require_feature(feature_name: str):
     """
@@ -66,9 +119,11 @@ def require_feature(feature_name: str):
     This dependency automatically resolves the outlet via `is_outlet_admin`.
     Raises HTTPException if the feature is not enabled for the outlet.
     """
-    async def _feature_checker(outlet: Outlet = Depends(is_outlet_admin)) -> Outlet:
-        # The M2M relation now points to GlobalFeature, so we check its name.
-        if not await outlet.features.filter(name=feature_name).aexists():
+    async def _feature_checker(
+        outlet: Outlet = Depends(is_outlet_admin),
+        context: OutletAuthContext = Depends(get_outlet_auth_context),
+    ) -> Outlet:
+        if feature_name not in context.features:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Feature '{feature_name}' is not enabled for this outlet."
@@ -1,8 +1,9 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from dishto.GlobalUtils import generate_unique_hash
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
+from core.cache import bump_outlets_version, invalidate_franchises, invalidate_outlet_auth
 # Create your models here.
 
 
@@ -72,6 +73,7 @@ class Outlet(TimeStampedModel):
     franchise = models.ForeignKey('core.Franchise', on_delete=models.CASCADE)
     admin = models.ForeignKey('Profile.Profile', on_delete=models.SET_NULL,null=True,blank=True)
     cover_image = models.ImageField(upload_to='outlet_cover_images/', null=True, blank=True)
+    cover_image_variants = models.JSONField(default=dict, blank=True)  # see core.utils.images.ingest_image
     features = models.ManyToManyField(GlobalFeature, through=OutletFeature, related_name='outlets_with_feature')
     superadmin_approved = models.BooleanField(default=False)
     slug = models.SlugField(unique=True, null=True, blank=True)
@@ -162,6 +164,7 @@ def process_feature_request(sender, instance, created, **kwargs):
 class OutletSliderImage(TimeStampedModel):
     outlet = models.ForeignKey('core.Outlet', on_delete=models.CASCADE, related_name='slider_images')
     image = models.ImageField(upload_to='outlet_slider_images/')
+    image_variants = models.JSONField(default=dict, blank=True)  # see core.utils.images.ingest_image
     order = models.PositiveIntegerField(default=0)
     slug = models.SlugField(unique=True, null=True, blank=True)
 
@@ -172,4 +175,58 @@ class OutletSliderImage(TimeStampedModel):
 
     def __str__(self):
         return self.image.name if self.image else str(self.pk)
-    
\ No newline at end of file
+
+
+@receiver([post_save, post_delete], sender=Franchise)
+def bump_outlets_version_on_franchise_change(sender, instance, **kwargs):
+    bump_outlets_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Franchise)
+def invalidate_franchise_cache(sender, instance, **kwargs):
+    invalidate_franchises()
+
+
+@receiver([post_save, post_delete], sender=Outlet)
+def bump_outlets_version_on_outlet_change(sender, instance, **kwargs):
+    bump_outlets_version(instance.franchise_id)
+
+
+@receiver([post_save, post_delete], sender=Outlet)
+def invalidate_outlet_auth_on_outlet_change(sender, instance, **kwargs):
+    invalidate_outlet_auth(instance.franchise_id)
+
+
+@receiver([post_save, post_delete], sender=OutletFeature)
+def invalidate_outlet_auth_on_feature_change(sender, instance, **kwargs):
+    # Also covers approved OutletFeatureRequests, which create/delete OutletFeature rows.
+    invalidate_outlet_auth(Outlet.objects.filter(pk=instance.outlet_id).values_list("franchise_id", flat=True).first())
+
+
+@receiver(m2m_changed, sender=Outlet.features.through)
+def invalidate_outlet_auth_on_features_m2m_change(sender, instance, action, reverse, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # Changed from the GlobalFeature side; a clear may affect any outlet.
+        outlets = Outlet.objects.filter(pk__in=kwargs["pk_set"]) if kwargs.get("pk_set") else Outlet.objects.all()
+        for franchise_id in outlets.values_list("franchise_id", flat=True).distinct():
+            invalidate_outlet_auth(franchise_id)
+    else:
+        invalidate_outlet_auth(instance.franchise_id)
+
+
+@receiver([post_save, post_delete], sender=OutletSliderImage)
+def bump_outlets_version_on_slider_image_change(sender, instance, **kwargs):
+    franchise_id = Outlet.objects.filter(pk=instance.outlet_id).values_list("franchise_id", flat=True).first()
+    bump_outlets_version(franchise_id)
+
+
+@receiver(post_save, sender=User)
+def bump_outlets_version_on_admin_change(sender, instance, created, **kwargs):
+    # The public outlet listing exposes the outlet admin's email.
+    if created:
+        return
+    franchise_ids = Outlet.objects.filter(admin=instance).values_list("franchise_id", flat=True).distinct()
+    for franchise_id in franchise_ids:
+        bump_outlets_version(franchise_id)
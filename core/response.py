@@ -14,12 +14,16 @@ class FranchiseObjects(BaseModel):
 
 class OutletSliderImageObject(BaseModel):
     image: str
+    image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    image_placeholder: Optional[str] = None  # blurred data URI
     order: int
 
 class OutletObject(BaseModel):
     name: str
     slug: str
     cover_image: Optional[str] = None
+    cover_image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    cover_image_placeholder: Optional[str] = None  # blurred data URI
     mid_page_slider: Optional[List[OutletSliderImageObject]] = None
     admin: Optional['UserResponse'] = None # Added for manager context
 
@@ -35,6 +39,8 @@ class OutletCreationResponse(BaseModel):
     name: str
     slug: str
     cover_image: Optional[str] = None
+    cover_image_srcset: Optional[dict[str, str]] = None  # {format: srcset}
+    cover_image_placeholder: Optional[str] = None  # blurred data URI
     mid_page_slider: Optional[List[OutletSliderImageObject]] = None
 
 # --- New Schemas for Feature Management ---
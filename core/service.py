@@ -1,3 +1,5 @@
+import asyncio
+
 from core.response import (    
     OutletObject,    
     OutletObjectsUser,
@@ -13,6 +15,8 @@ from core.response import (
     OutletActiveFeatureResponse
 )
 
+from core.utils.images import InvalidImageError, adelete_image, aingest_image, responsive_image
+
 from core.request import (
     FranchiseCreationRequest,
     OutletCreationRequest,
@@ -32,6 +36,13 @@ from asgiref.sync import sync_to_async
 User = get_user_model()
 
 
+def slider_image_object(slider_image: OutletSliderImage) -> OutletSliderImageObject:
+    return OutletSliderImageObject(
+        **responsive_image(slider_image.image, slider_image.image_variants),
+        order=slider_image.order,
+    )
+
+
 class RestaurantService:
     # ... existing RestaurantService methods ...
     async def create_franchise(self, body: FranchiseCreationRequest):
@@ -95,26 +106,41 @@ class RestaurantService:
             # Save cover image if provided
             slider_objs = []
             if cover_image:
-                outlet.cover_image.save(cover_image.name, cover_image, save=False)
-                await outlet.asave()
+                # Stored as a resized WebP original plus responsive variants
+                try:
+                    outlet.cover_image_variants = await aingest_image(outlet.cover_image, cover_image, outlet.slug)
+                except InvalidImageError:
+                    await outlet.adelete()
+                    raise
+                await outlet.asave(update_fields=["cover_image", "cover_image_variants", "updated_at"])
             # Save slider images if provided
             if mid_page_slider:
                 from .models import OutletSliderImage
-                for idx, slider_file in enumerate(mid_page_slider):
-                    slider_obj = await OutletSliderImage.objects.acreate(
-                        outlet=outlet,
-                        order=idx
-                    )
-                    slider_obj.image.save(slider_file.name, slider_file, save=False)
-                    await slider_obj.asave()
-                    slider_objs.append(slider_obj)
+                slider_objs = [
+                    OutletSliderImage(outlet=outlet, order=idx) for idx in range(len(mid_page_slider))
+                ]
+                # Ingested like the cover image, at most IMAGE_INGEST_WORKERS at a time
+                results = await asyncio.gather(*(
+                    aingest_image(slider_obj.image, slider_file, f"{outlet.slug}_{slider_obj.order}")
+                    for slider_obj, slider_file in zip(slider_objs, mid_page_slider)
+                ), return_exceptions=True)
+                error = next((result for result in results if isinstance(result, Exception)), None)
+                if error is not None:
+                    for slider_obj, result in zip(slider_objs, results):
+                        if not isinstance(result, Exception):
+                            await adelete_image(slider_obj.image, result)
+                    await adelete_image(outlet.cover_image, outlet.cover_image_variants)
+                    await outlet.adelete()
+                    raise error
+                for slider_obj, image_variants in zip(slider_objs, results):
+                    slider_obj.image_variants = image_variants
+                    await slider_obj.asave()  # save() assigns the slug
             # Prepare response
-            from .response import OutletSliderImageObject
-            slider_response = [OutletSliderImageObject(image=img.image.url, order=img.order) for img in slider_objs] if slider_objs else None
+            slider_response = [slider_image_object(img) for img in slider_objs] if slider_objs else None
             return OutletCreationResponse(
                 name=outlet.name,
                 slug=str(outlet.slug) if outlet.slug else "",
-                cover_image=outlet.cover_image.url if outlet.cover_image else None,
+                **responsive_image(outlet.cover_image, outlet.cover_image_variants, prefix="cover_image"),
                 mid_page_slider=slider_response
             )
         except Franchise.DoesNotExist:
@@ -122,6 +148,11 @@ class RestaurantService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Franchise does not exist."
             )
+        except InvalidImageError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:                        
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -141,12 +172,12 @@ class RestaurantService:
                 outlet_objs = []
                 for o in outlets:
                     slider_imgs = await get_queryset(list, OutletSliderImage.objects.filter(outlet=o).order_by("order"))
-                    slider_response = [OutletSliderImageObject(image=img.image.url, order=img.order) for img in slider_imgs] if slider_imgs else None
+                    slider_response = [slider_image_object(img) for img in slider_imgs] if slider_imgs else None
                     outlet_objs.append(
                         OutletObject(
                             name=o.name,
                             slug=o.slug,
-                            cover_image=o.cover_image.url if o.cover_image else None,
+                            **responsive_image(o.cover_image, o.cover_image_variants, prefix="cover_image"),
                             mid_page_slider=slider_response,
                             admin=UserResponse(email=o.admin.email) if o.admin else None
                         )
@@ -159,11 +190,11 @@ class RestaurantService:
                 try:
                     outlet = await Outlet.objects.select_related('admin').aget(slug=slug, franchise=franchise)
                     slider_imgs = await get_queryset(list, OutletSliderImage.objects.filter(outlet=outlet).order_by("order"))
-                    slider_response = [OutletSliderImageObject(image=img.image.url, order=img.order) for img in slider_imgs] if slider_imgs else None
+                    slider_response = [slider_image_object(img) for img in slider_imgs] if slider_imgs else None
                     return OutletObject(
                         name=outlet.name,
                         slug=outlet.slug,
-                        cover_image=outlet.cover_image.url if outlet.cover_image else None,
+                        **responsive_image(outlet.cover_image, outlet.cover_image_variants, prefix="cover_image"),
                         mid_page_slider=slider_response,
                         admin=UserResponse(email=outlet.admin.email) if outlet.admin else None
                     )
@@ -186,12 +217,12 @@ class RestaurantService:
             async for o in Outlet.objects.select_related('admin').prefetch_related(slider_prefetch).filter(franchise=franchise):                
                 slider_images = []
                 async for img in o.slider_images.all():
-                    slider_images.append(OutletSliderImageObject(image=img.image.url, order=img.order))
+                    slider_images.append(slider_image_object(img))
                 outlet_objs.append(
                     OutletObject(
                         name=o.name,
                         slug=str(o.slug) if o.slug else "",
-                        cover_image=o.cover_image.url if o.cover_image else None,
+                        **responsive_image(o.cover_image, o.cover_image_variants, prefix="cover_image"),
                         mid_page_slider=slider_images if slider_images else None,
                         admin=UserResponse(email=o.admin.email) if o.admin else None
                     )
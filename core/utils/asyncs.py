@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 from asgiref.sync import sync_to_async
 
 async def get_queryset(func, *args, **kwargs):
@@ -10,4 +13,19 @@ async def get_related_object(instance, field_name: str):
     return await sync_to_async(lambda: getattr(instance, field_name))()
 
 async def is_valid_async(serializer):
-    return await sync_to_async(serializer.is_valid)()
\ No newline at end of file
+    return await sync_to_async(serializer.is_valid)()
+
+_worker_loops = threading.local()
+
+def run_async(coro):
+    """
+    Runs a coroutine to completion from synchronous code (Celery tasks) on an
+    event loop that lives as long as the calling thread. Unlike asyncio.run, the
+    loop and the per-loop Qdrant and Gemini clients are reused across tasks (the
+    async Redis client is a single one for the whole process).
+    """
+    loop = getattr(_worker_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _worker_loops.loop = loop
+    return loop.run_until_complete(coro)
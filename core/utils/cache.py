@@ -0,0 +1,190 @@
+import threading
+import time
+
+import redis
+import redis.asyncio as aioredis
+from cachetools import TTLCache
+from django.conf import settings
+
+from core.utils.logger import logger
+
+_redis_client: redis.Redis | None = None
+_async_redis_client: aioredis.Redis | None = None
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Returns the process-wide synchronous Redis client.
+    Used from signal handlers and Celery tasks, which run outside the event loop.
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+    return _redis_client
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """
+    Returns the process-wide asyncio Redis client used by request handlers.
+    """
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis.from_url(settings.CACHE_REDIS_URL)
+    return _async_redis_client
+
+
+async def close_async_redis_client() -> None:
+    global _async_redis_client
+    if _async_redis_client is not None:
+        await _async_redis_client.aclose()
+        _async_redis_client = None
+
+
+def _content_version_key(scope: str) -> str:
+    return f"content_version:{scope}"
+
+
+def _initial_content_version() -> int:
+    # Seeded from the clock so a counter lost to eviction or expiry never
+    # restarts at a value that an older cached payload was stored under.
+    return time.time_ns() // 1000
+
+
+def bump_content_version(scope: str) -> int | None:
+    """
+    Increments the content version of `scope` (e.g. "menu:<outlet_slug>").
+    Returns the new version, or None if Redis is unavailable.
+    """
+    key = _content_version_key(scope)
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.set(key, _initial_content_version(), nx=True, ex=settings.CONTENT_VERSION_TTL)
+        pipe.incr(key)
+        pipe.expire(key, settings.CONTENT_VERSION_TTL)
+        _, version, _ = pipe.execute()
+        return int(version)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to bump content version for '{scope}': {e}")
+        return None
+
+
+async def abump_content_version(scope: str) -> int | None:
+    key = _content_version_key(scope)
+    try:
+        pipe = get_async_redis_client().pipeline()
+        pipe.set(key, _initial_content_version(), nx=True, ex=settings.CONTENT_VERSION_TTL)
+        pipe.incr(key)
+        pipe.expire(key, settings.CONTENT_VERSION_TTL)
+        _, version, _ = await pipe.execute()
+        return int(version)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to bump content version for '{scope}': {e}")
+        return None
+
+
+async def get_content_version(scope: str) -> int | None:
+    """
+    Returns the current content version of `scope`, initialising it on first use.
+    Returns None if Redis is unavailable, in which case callers must not cache.
+
+    Counters expire after CONTENT_VERSION_TTL without reads or bumps, so
+    versions seeded for slugs that do not exist do not accumulate.
+    """
+    key = _content_version_key(scope)
+    try:
+        pipe = get_async_redis_client().pipeline()
+        pipe.set(key, _initial_content_version(), nx=True, ex=settings.CONTENT_VERSION_TTL)
+        pipe.getex(key, ex=settings.CONTENT_VERSION_TTL)
+        _, version = await pipe.execute()
+        return int(version)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read content version for '{scope}': {e}")
+        return None
+
+
+_MISSING = object()
+_local_caches: dict[str, "LocalTTLCache"] = {}
+
+
+class LocalTTLCache:
+    """
+    Bounded, LRU-evicted in-process cache with a per-entry TTL.
+
+    Storing `None` records a negative entry (e.g. "no such franchise"), which
+    expires after `negative_ttl`. Entries live in the worker process, so changes
+    made by other workers become visible after at most `ttl` seconds; local
+    changes should call `invalidate`. Hit/miss counters are exposed through
+    `stats()` and the superadmin cache stats endpoint.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, negative_ttl: float | None = None):
+        self.name = name
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._negative = TTLCache(maxsize=maxsize, ttl=ttl if negative_ttl is None else negative_ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        _local_caches[name] = self
+
+    def get(self, key) -> tuple[bool, object]:
+        """
+        Returns `(found, value)`; `value` is None for negative entries.
+        """
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return True, value
+            if key in self._negative:
+                self.negative_hits += 1
+                return True, None
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            if value is None:
+                self._entries.pop(key, None)
+                self._negative[key] = True
+            else:
+                self._negative.pop(key, None)
+                self._entries[key] = value
+
+    def invalidate(self, key=_MISSING) -> None:
+        """
+        Drops one key, or every entry when called without arguments.
+        """
+        with self._lock:
+            self.invalidations += 1
+            if key is _MISSING:
+                self._entries.clear()
+                self._negative.clear()
+            else:
+                self._entries.pop(key, None)
+                self._negative.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._entries.expire()
+            self._negative.expire()
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "negative_size": len(self._negative),
+                "maxsize": self._entries.maxsize,
+                "ttl": self._entries.ttl,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+            }
+
+
+def local_cache_stats() -> dict:
+    """
+    Returns the counters of every in-process cache of this worker, keyed by name.
+    """
+    return {name: cache.stats() for name, cache in _local_caches.items()}
@@ -0,0 +1,94 @@
+import asyncio
+import weakref
+
+from django.conf import settings
+from google import genai
+from google.genai import types
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from core.utils.logger import logger
+
+# Async clients hold connection pools bound to the event loop that first used
+# them, so there is one per loop: the uvicorn loop in the API, and whatever loop
+# a Celery task runs on in workers.
+_async_qdrant_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncQdrantClient]" = weakref.WeakKeyDictionary()
+_genai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.Client]" = weakref.WeakKeyDictionary()
+
+_qdrant_client: QdrantClient | None = None
+_sync_genai_client: genai.Client | None = None
+
+
+def _new_genai_client() -> genai.Client:
+    return genai.Client(
+        api_key=settings.GEMINI_API_KEY,
+        http_options=types.HttpOptions(timeout=int(settings.GEMINI_TIMEOUT * 1000)),  # milliseconds
+    )
+
+
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """
+    Returns the pooled AsyncQdrantClient of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_qdrant_clients.get(loop)
+    if client is None:
+        client = AsyncQdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT, timeout=settings.QDRANT_TIMEOUT)
+        _async_qdrant_clients[loop] = client
+    return client
+
+
+def get_async_genai_client():
+    """
+    Returns the async Gemini API (`client.aio`) of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _genai_clients.get(loop)
+    if client is None:
+        client = _new_genai_client()
+        _genai_clients[loop] = client
+    return client.aio
+
+
+def get_qdrant_client() -> QdrantClient:
+    """
+    Returns the process-wide synchronous Qdrant client, for code running in threads.
+    """
+    global _qdrant_client
+    if _qdrant_client is None:
+        _qdrant_client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT, timeout=settings.QDRANT_TIMEOUT)
+    return _qdrant_client
+
+
+def get_genai_client() -> genai.Client:
+    """
+    Returns the process-wide Gemini client for blocking calls made from threads.
+    """
+    global _sync_genai_client
+    if _sync_genai_client is None:
+        _sync_genai_client = _new_genai_client()
+    return _sync_genai_client
+
+
+async def init_async_clients() -> None:
+    """
+    Creates the async clients of the running loop up front, so the first
+    request does not pay for it.
+    """
+    get_async_qdrant_client()
+    get_async_genai_client()
+    logger.info(f"Qdrant client initialized with host: {settings.QDRANT_HOST} and port: {settings.QDRANT_PORT}")
+
+
+async def close_async_clients() -> None:
+    """
+    Closes the async clients of the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    qdrant = _async_qdrant_clients.pop(loop, None)
+    if qdrant is not None:
+        await qdrant.close()
+    client = _genai_clients.pop(loop, None)
+    # `aclose` only exists on newer google-genai releases.
+    aclose = getattr(client.aio, "aclose", None) if client is not None else None
+    if aclose is not None:
+        await aclose()
@@ -118,6 +118,11 @@ Write an enhanced, vivid, and appetizing description for a menu or food app, lim
 Output only the enhanced description — no preamble, headers, or labels.
 """
 
+MENU_ITEMS_BULK_DESCRIPTION_ENHANCEMENT_SYSTEM_PROMPT = MENU_ITEM_DESCRIPTION_ENHANCEMENT_SYSTEM_PROMPT + """
+You will receive several food items at once, one JSON object per line with an "id", a "name" and a "description".
+Enhance every item independently. Respond with a JSON array containing one object per item, {"id": <the item's id>, "description": <the enhanced description>}.
+"""
+
 MENU_CATEGORY_IMAGE_GENRATION_PROMPT = """ **Situation**
 You are a professional food photographer specializing in creating high-quality, menu-ready images for digital restaurant menus. The goal is to capture a visually appealing, appetizing representation of a dish that entices potential diners while providing a clean, professional layout.
 
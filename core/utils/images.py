@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError, features
+
+from core.utils.storage import run_storage_io
+
+# Widths (px) of the responsive variants; none wider than the source is made.
+IMAGE_VARIANT_WIDTHS = (320, 640, 1024)
+# Longest side of the stored original
+MAX_IMAGE_DIMENSION = 2048
+PLACEHOLDER_WIDTH = 16
+# Decoded size limit (~40 megapixels, 160MB as RGBA); larger sources are refused
+MAX_IMAGE_PIXELS = 40_000_000
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+
+# Decoding and encoding are CPU bound and hold whole images in memory, so ingestion
+# gets its own small pool, apart from the storage I/O one: at most
+# IMAGE_INGEST_WORKERS images are decoded at a time per process.
+_ingest_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_INGEST_WORKERS, thread_name_prefix="image-ingest"
+)
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+def _variant_formats() -> list[str]:
+    # AVIF needs a Pillow build with libavif
+    return ["webp", "avif"] if features.check("avif") else ["webp"]
+
+
+def _encode(image: Image.Image, format: str, **options) -> bytes:
+    buffer = BytesIO()
+    # No exif/icc_profile is passed on, so camera metadata (GPS etc.) is dropped
+    image.save(buffer, format=format.upper(), **options)
+    return buffer.getvalue()
+
+
+def _encode_variant(image: Image.Image, format: str) -> bytes:
+    if format == "avif":
+        return _encode(image, format, quality=AVIF_QUALITY)
+    return _encode(image, format, quality=WEBP_QUALITY, method=4)
+
+
+def _decode(source_file) -> Image.Image:
+    if isinstance(source_file, bytes):
+        source_file = BytesIO(source_file)
+    else:
+        source_file.seek(0)
+    try:
+        # Reads the header only; pixels are decoded by load()
+        with Image.open(source_file) as source:
+            if source.width * source.height > MAX_IMAGE_PIXELS:
+                raise InvalidImageError("Image dimensions are too large.")
+            # JPEGs are decoded directly at a reduced scale when far larger than
+            # what is kept, which bounds memory for big camera photos
+            source.draft("RGB", (MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION))
+            source.load()
+            image = ImageOps.exif_transpose(source)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError(f"Could not read image: {e}")
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    image.thumbnail((MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION), Image.Resampling.LANCZOS)
+    return image
+
+
+def _placeholder(image: Image.Image) -> str:
+    small = image.copy()
+    small.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH), Image.Resampling.LANCZOS)
+    small = small.filter(ImageFilter.GaussianBlur(1))
+    return "data:image/webp;base64," + base64.b64encode(_encode(small, "webp", quality=30)).decode()
+
+
+def ingest_image(field_file, source_file, name_stem: str) -> dict:
+    """
+    Decodes an uploaded or generated image (bytes or a file, e.g. a spooled
+    upload) once, and stores:
+    - the original, orientation applied, metadata stripped, capped at
+      MAX_IMAGE_DIMENSION and re-encoded as WebP, into `field_file` (unsaved model);
+    - WebP (and AVIF, when available) variants at IMAGE_VARIANT_WIDTHS next to it.
+
+    Returns the manifest to keep on the model: size, a blurred inline placeholder
+    and the storage names of the variants ({format: {width: name}}). Blocking;
+    use aingest_image from async code.
+    """
+    image = _decode(source_file)
+    width, height = image.size
+
+    field_file.save(f"{name_stem}.webp", ContentFile(_encode_variant(image, "webp")), save=False)
+    storage = field_file.storage
+    directory, filename = posixpath.split(field_file.name)
+    base = filename.rsplit(".", 1)[0]
+
+    variants = {}
+    for format in _variant_formats():
+        widths = [w for w in IMAGE_VARIANT_WIDTHS if w < width]
+        if format != "webp":
+            widths.append(width)  # the WebP original already covers full width
+        for w in widths:
+            resized = image if w == width else image.resize((w, max(1, round(height * w / width))), Image.Resampling.LANCZOS)
+            name = storage.save(
+                posixpath.join(directory, "variants", f"{base}_{w}.{format}"),
+                ContentFile(_encode_variant(resized, format)),
+            )
+            variants.setdefault(format, {})[str(w)] = name
+
+    return {"width": width, "height": height, "placeholder": _placeholder(image), "variants": variants}
+
+
+async def aingest_image(field_file, source_file, name_stem: str) -> dict:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ingest_executor, ingest_image, field_file, source_file, name_stem)
+
+
+def delete_image_variants(storage, manifest: dict | None) -> None:
+    for names in (manifest or {}).get("variants", {}).values():
+        for name in names.values():
+            storage.delete(name)
+
+
+def delete_image(field_file, manifest: dict | None) -> None:
+    """
+    Removes an image's original and its variants, e.g. when its model is deleted.
+    """
+    if field_file:
+        field_file.storage.delete(field_file.name)
+    delete_image_variants(field_file.storage, manifest)
+
+
+async def adelete_image(field_file, manifest: dict | None) -> None:
+    await run_storage_io(delete_image, field_file, manifest)
+
+
+def delete_replaced_image(field_file, previous_name: str | None, previous_variants: dict | None) -> None:
+    """
+    Removes the files of an image that was just replaced and saved over.
+    """
+    if previous_name and previous_name != field_file.name:
+        field_file.storage.delete(previous_name)
+    delete_image_variants(field_file.storage, previous_variants)
+
+
+async def adelete_replaced_image(field_file, previous_name: str | None, previous_variants: dict | None) -> None:
+    await run_storage_io(delete_replaced_image, field_file, previous_name, previous_variants)
+
+
+def responsive_image(field_file, manifest: dict | None, prefix: str = "image") -> dict:
+    """
+    Response fields for an ingested image: `<prefix>` (the original URL),
+    `<prefix>_srcset` ({format: "url 320w, url 640w, ..."}) and
+    `<prefix>_placeholder`. Images stored before ingestion only have a URL.
+    """
+    if not field_file:
+        return {prefix: None, f"{prefix}_srcset": None, f"{prefix}_placeholder": None}
+    manifest = manifest or {}
+    srcset = {}
+    for format, names in manifest.get("variants", {}).items():
+        entries = [(int(w), field_file.storage.url(name)) for w, name in names.items()]
+        if format == "webp" and manifest.get("width"):
+            entries.append((manifest["width"], field_file.url))
+        srcset[format] = ", ".join(f"{url} {w}w" for w, url in sorted(entries))
+    return {
+        prefix: field_file.url,
+        f"{prefix}_srcset": srcset or None,
+        f"{prefix}_placeholder": manifest.get("placeholder"),
+    }
@@ -4,19 +4,19 @@ from cryptography.hazmat.primitives import serialization
 
 from django.conf import settings
 from core.utils.logger import logger
-from dishto.GlobalUtils import qdrant_client_
-from qdrant_client.models import VectorParams, Distance
-from core.utils.constants import MENUITEM_COLLECTION_NAME
+from core.utils.clients import init_async_clients, close_async_clients, get_async_qdrant_client
+from core.utils.cache import close_async_redis_client
+from Menu.collection import ensure_menu_item_collection
 
 
 @asynccontextmanager
 async def lifespan(app):
     """Asynchronous context manager to manage the lifespan of the application.
     """
-    # create qdrant collections
-    if not qdrant_client_.collection_exists(MENUITEM_COLLECTION_NAME):
-        qdrant_client_.create_collection(
-            collection_name=MENUITEM_COLLECTION_NAME,
-            vectors_config=VectorParams(size=768, distance=Distance.COSINE),
-        )
-    yield
\ No newline at end of file
+    await init_async_clients()
+    qdrant_client = get_async_qdrant_client()
+    # create the qdrant collection (behind its alias) on first start
+    await ensure_menu_item_collection(qdrant_client)
+    yield
+    await close_async_clients()
+    await close_async_redis_client()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+
+from django.conf import settings
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Content codings we can pre-compress into, in order of preference.
+AVAILABLE_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def encode_variants(body: bytes) -> dict[str, bytes]:
+    """
+    Pre-compresses a response body into every available content coding.
+    Meant for payloads that are built once and served many times, so the
+    slowest (smallest) compression levels are used.
+    """
+    variants = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def negotiate_encoding(accept_encoding: str | None, available=AVAILABLE_ENCODINGS) -> str:
+    """
+    Picks the preferred content coding from an Accept-Encoding header.
+    Falls back to "identity" when the client accepts none of `available`.
+    """
+    if not accept_encoding:
+        return "identity"
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for coding in available:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return "identity"
+
+
+def encoded_json_response(body: bytes, encoding: str, headers: dict | None = None) -> Response:
+    """
+    Wraps an already serialized (and possibly compressed) JSON body in a response.
+    """
+    response_headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    if headers:
+        response_headers.update(headers)
+    return Response(content=body, media_type="application/json", headers=response_headers)
+
+
+def make_etag(*parts) -> str | None:
+    """
+    Builds a strong ETag from the parts that identify a representation
+    (typically the request path, the owning franchise and a content version).
+    Returns None when any part is unknown, e.g. because Redis is unavailable
+    and no content version could be read; such responses are not cacheable.
+    """
+    if any(part is None for part in parts):
+        return None
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str | None) -> bool:
+    """
+    Evaluates If-None-Match against `etag` (weak comparison, as required for GET).
+    """
+    if etag is None:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str | None) -> dict:
+    """
+    Validator and freshness headers for public, CDN-cacheable responses.
+    """
+    if etag is None:
+        return {}
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.OPEN_API_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={settings.OPEN_API_STALE_WHILE_REVALIDATE}"
+        ),
+    }
+
+
+def not_modified_response(etag: str, headers: dict | None = None) -> Response:
+    response_headers = cache_headers(etag)
+    if headers:
+        response_headers.update(headers)
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+
+
+def model_json_response(model: BaseModel, headers: dict | None = None) -> Response:
+    """
+    Serializes a response model the same way FastAPI would (by alias) and
+    attaches extra headers, e.g. those from `cache_headers`.
+    """
+    return Response(
+        content=model.model_dump_json(by_alias=True),
+        media_type="application/json",
+        headers=headers,
+    )
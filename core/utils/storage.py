@@ -0,0 +1,62 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable
+
+from django.conf import settings
+
+# Storage backends (FileSystemStorage, S3Storage) are blocking. Their calls run in
+# this pool rather than anyio's shared one, so a burst of uploads to a slow bucket
+# queues here instead of starving sync_to_async and other to_thread work.
+_storage_executor = ThreadPoolExecutor(
+    max_workers=settings.STORAGE_IO_WORKERS, thread_name_prefix="storage-io"
+)
+
+
+async def run_storage_io(func: Callable, /, *args, **kwargs):
+    """
+    Runs a blocking function that reads or writes media storage in the storage
+    pool and awaits its result without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_storage_executor, partial(func, *args, **kwargs))
+
+
+def direct_uploads_supported() -> bool:
+    return settings.STORAGE_BACKEND == "s3"
+
+
+@lru_cache(maxsize=1)
+def _presign_client():
+    # boto3 is only installed for the S3 backend
+    import boto3
+    from botocore.config import Config
+
+    options = settings.STORAGES["default"]["OPTIONS"]
+    return boto3.client(
+        "s3",
+        # The URL goes to browsers, which may reach the store under another host than the API does
+        endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL or options["endpoint_url"],
+        aws_access_key_id=options["access_key"],
+        aws_secret_access_key=options["secret_key"],
+        region_name=options["region_name"],
+        config=Config(signature_version="s3v4", s3={"addressing_style": options["addressing_style"]}),
+    )
+
+
+def presigned_put_url(name: str, content_type: str, size: int, expires_in: int) -> str:
+    """
+    A URL the client can PUT exactly `size` bytes of `content_type` to, stored
+    as `name` in the media bucket. Signing is local; no request is made.
+    """
+    return _presign_client().generate_presigned_url(
+        "put_object",
+        Params={
+            "Bucket": settings.STORAGES["default"]["OPTIONS"]["bucket_name"],
+            "Key": name,
+            "ContentType": content_type,
+            "ContentLength": size,  # signed, so the store rejects any other length
+        },
+        ExpiresIn=expires_in,
+        HttpMethod="PUT",
+    )
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.files import File
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+# Enough of the header to tell every accepted format apart
+SNIFF_BYTES = 32
+
+# ISO-BMFF brands (the bytes after "ftyp") of the AVIF/HEIF images phones produce
+_HEIF_BRANDS = {b"avif", b"avis", b"heic", b"heix", b"hevc", b"mif1", b"msf1"}
+
+
+def sniff_image_type(header: bytes) -> str | None:
+    """
+    Identifies an image by its magic bytes; the client's Content-Type and file
+    extension are not trusted. Returns "jpeg", "png", "gif", "webp", "avif" or None.
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[4:8] == b"ftyp" and header[8:12] in _HEIF_BRANDS:
+        return "avif"
+    return None
+
+
+def _measure(file) -> int:
+    file.seek(0, 2)
+    size = file.tell()
+    file.seek(0)
+    return size
+
+
+async def upload_size(upload: UploadFile) -> int:
+    """
+    The size of an upload in bytes. UploadFile.size is None when the client
+    sent no length for the part, in which case the spooled file is measured.
+    """
+    return upload.size if upload.size is not None else await run_in_threadpool(_measure, upload.file)
+
+
+async def open_image_upload(upload: UploadFile, label: str = "Image", max_size: int | None = None) -> File:
+    """
+    Validates an uploaded image without reading it into memory.
+
+    The multipart parser has already streamed the upload into a spooled
+    temporary file (kept in memory up to 1MB, on disk beyond), and
+    RequestSizeLimitMiddleware has capped the request while it streamed. This
+    checks the file's size and magic bytes and hands back a Django File over
+    the same spooled file, rewound, for storage or ingestion to read from.
+    """
+    max_size = max_size or settings.MAX_IMAGE_UPLOAD_SIZE
+    size = await upload_size(upload)
+    if size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} file too large. Maximum size is {max_size // (1024 * 1024)}MB.",
+        )
+    await upload.seek(0)
+    header = await upload.read(SNIFF_BYTES)
+    await upload.seek(0)
+    if sniff_image_type(header) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} must be a JPEG, PNG, GIF, WebP or AVIF image.",
+        )
+    return File(upload.file, name=upload.filename)
@@ -28,9 +28,11 @@ from core.response import (
 
 from core.schema import BaseResponse
 from core.service import RestaurantService, FeatureService # New FeatureService
-from django.core.files.base import ContentFile
-from core.dependencies import is_superadmin, is_outlet_admin, franchise_exists, is_franchise_admin
+from core.dependencies import is_superadmin, is_outlet_admin, franchise_exists, is_franchise_admin, get_current_user
 from core.utils.limiters import limiter
+from core.utils.uploads import open_image_upload
+from core.utils.responses import cache_headers, is_not_modified, make_etag, model_json_response, not_modified_response
+from core.cache import get_outlets_version
 from django.contrib.auth import get_user_model # New import
 from .models import Outlet # New import for Outlet model
 
@@ -51,9 +53,12 @@ end_user_router = APIRouter(tags=["End User"])
 async def get_outlets_for_user(
     request: Request, service: RestaurantService = Depends(RestaurantService)
 ) -> BaseResponse[OutletObjectsUser]:    
-    return BaseResponse(
-        data=await service.get_user_outlets(franchise=request.state.franchise)
-    )
+    franchise = request.state.franchise
+    etag = make_etag(request.url.path, franchise.slug, await get_outlets_version(franchise.id))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    data = await service.get_user_outlets(franchise=franchise)
+    return model_json_response(BaseResponse[OutletObjectsUser](data=data), headers=cache_headers(etag))
 
 restaurant_router = APIRouter(prefix="/restaurant", tags=["Restaurant"])
 
@@ -117,30 +122,14 @@ async def create_outlet(
 ) -> BaseResponse[OutletCreationResponse]:
     cover_image_file = None
     slider_image_files = []
+    # Each upload is validated in place and stays in its spooled temporary file,
+    # so the slider images are never all held in memory at once
     if cover_image is not None and cover_image.filename:
-        if not cover_image.content_type or not cover_image.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Cover image must be an image file"
-            )
-        if cover_image.size and cover_image.size > 5 * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cover image file too large. Maximum size is 5MB.",
-            )
-        cover_image_file = ContentFile(await cover_image.read(), name=cover_image.filename)
+        cover_image_file = await open_image_upload(cover_image, label="Cover image")
     if mid_page_slider:
         for idx, slider_image in enumerate(mid_page_slider):
             if slider_image is not None and slider_image.filename:
-                if not slider_image.content_type or not slider_image.content_type.startswith("image/"):
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST, detail=f"Slider image {idx+1} must be an image file"
-                    )
-                if slider_image.size and slider_image.size > 5 * 1024 * 1024:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Slider image {idx+1} file too large. Maximum size is 5MB.",
-                    )
-                slider_image_files.append(ContentFile(await slider_image.read(), name=slider_image.filename))
+                slider_image_files.append(await open_image_upload(slider_image, label=f"Slider image {idx+1}"))
 
     request_data = OutletCreationRequest(name=name)
     return BaseResponse(
@@ -210,9 +199,9 @@ async def create_feature_request(
     request: Request,
     request_data: OutletFeatureRequestCreateRequest,
     outlet: Outlet = Depends(is_outlet_admin), # is_outlet_admin returns the Outlet object
+    requested_by_user = Depends(get_current_user),
     service: FeatureService = Depends(FeatureService)
 ):
-    requested_by_user = request.state.user
     return BaseResponse(data=await service.create_feature_request(
         outlet=outlet,
         request_data=request_data,
@@ -271,9 +260,9 @@ async def update_feature_request(
     request_id: int,
     update_data: OutletFeatureRequestUpdateRequest,
     request: Request,
+    approved_by_user = Depends(get_current_user),
     service: FeatureService = Depends(FeatureService)
 ):
-    approved_by_user = request.state.user
     return BaseResponse(data=await service.update_feature_request(
         request_id=request_id,
         update_data=update_data,
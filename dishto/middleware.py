@@ -1,3 +1,5 @@
+import copy
+
 from fastapi.middleware.cors import CORSMiddleware
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.backends import TokenBackend
@@ -5,6 +7,8 @@ from rest_framework_simplejwt.exceptions import TokenError, InvalidToken, TokenB
 from django.conf import settings
 from fastapi import HTTPException, Request
 from core.models import Franchise
+from core.cache import franchise_cache, get_franchises_version
+from Profile.auth import TokenIdentity, get_cached_user
 from starlette.responses import JSONResponse
 from starlette.types import Scope, Receive, Send
 
@@ -30,6 +34,7 @@ class AuthMiddleware:
         request = Request(scope, receive=receive)
         scope.setdefault("state", {})
         scope["state"]["user"] = None
+        scope["state"]["identity"] = None
         
         # Skip auth for public paths
         path = request.url.path
@@ -43,8 +48,13 @@ class AuthMiddleware:
                 decoded = self.token_backend.decode(token, verify=True)
                 user_id = decoded.get("user_id")
                 if user_id:
-                    user = await User.objects.aget(id=user_id)
-                    scope["state"]["user"] = user
+                    identity = TokenIdentity.from_claims(decoded)
+                    if identity is None:
+                        user = await get_cached_user(user_id, decoded.get("pwv"))
+                        scope["state"]["user"] = user
+                        identity = TokenIdentity.from_user(user, decoded.get("pwv"))
+                    # With embedded claims the user is loaded on demand (see get_current_user).
+                    scope["state"]["identity"] = identity
             except (TokenBackendExpiredToken):
                 # For expired tokens, just continue without user
                 pass
@@ -71,37 +81,97 @@ class AuthMiddleware:
 class FranchiseMiddleware:
     def __init__(self, app):
         self.app = app
+        self.public_paths = {
+            '/docs', '/redoc', '/openapi.json'
+        }
+        self.dev_franchise_slug = 'ce3e5b235d3a418a_1749737758950'
+
+    async def resolve_franchise(self, **lookup) -> Franchise | None:
+        """
+        Resolves a franchise through the in-process cache. Unknown lookups are
+        cached as negative entries. A copy is returned so request handlers can
+        attach relations without mutating the shared cached instance.
+        """
+        # Without Redis (version None) entries still expire after FRANCHISE_CACHE_TTL
+        key = (next(iter(lookup.items())), await get_franchises_version())
+        found, franchise = franchise_cache.get(key)
+        if not found:
+            try:
+                franchise = await Franchise.objects.aget(**lookup)
+            except Franchise.DoesNotExist:
+                franchise = None
+            franchise_cache.set(key, franchise)
+        return copy.copy(franchise) if franchise is not None else None
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
+        scope.setdefault("state", {})
+        # Docs and static/media files never need the franchise.
+        path = scope["path"]
+        if path in self.public_paths or path.startswith('/static/') or path.startswith('/media/'):
+            await self.app(scope, receive, send)
+            return
+
         headers = dict(scope["headers"])
         host = headers.get(b"host", b"").decode("latin-1").split(":")[0]  # remove port if present
         parts = host.split(".")        
         subdomain = parts[0] if len(parts) > 2 else None
-        scope.setdefault("state", {})                
         if subdomain is not None:
             if subdomain == 'admin':
                 scope["state"]["franchise"] = None
             elif subdomain != '192':
-                try:
-                    franchise = await Franchise.objects.aget(subdomain=subdomain)
-                    scope["state"]["franchise"] = franchise
-                except Franchise.DoesNotExist:                    
+                franchise = await self.resolve_franchise(subdomain=subdomain)
+                if franchise is None:
                     response = JSONResponse({"detail": "Franchise not found"}, status_code=404)
                     await response(scope, receive, send)
                     return
+                scope["state"]["franchise"] = franchise
             else:
-                request = Request(scope, receive=receive)
-                test_cookie = request.cookies.get("dev")                                
-                scope["state"]["franchise"] = await Franchise.objects.aget(slug='ce3e5b235d3a418a_1749737758950')                
+                scope["state"]["franchise"] = await self.resolve_franchise(slug=self.dev_franchise_slug)
         if len(parts) == 1 and (parts[0] in ['localhost']):  
-            scope["state"]["franchise"] = await Franchise.objects.aget(slug='ce3e5b235d3a418a_1749737758950')
+            scope["state"]["franchise"] = await self.resolve_franchise(slug=self.dev_franchise_slug)
         await self.app(scope, receive, send)
 
 
+class RequestSizeLimitMiddleware:
+    """
+    Caps request bodies at MAX_REQUEST_BODY_SIZE while they stream in, so an
+    oversized upload is cut off after the limit instead of being spooled whole.
+    A declared Content-Length over the limit is refused before reading anything.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.MAX_REQUEST_BODY_SIZE
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": "Request body too large"}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the body parser; FastAPI passes HTTPException through
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
 def setup_middleware(fastapi_app) -> None:
     """Set up middleware for the FastAPI application."""
     # Add CORS middleware
@@ -114,5 +184,6 @@ def setup_middleware(fastapi_app) -> None:
     )
     fastapi_app.add_middleware(FranchiseMiddleware)
     fastapi_app.add_middleware(AuthMiddleware)
+    fastapi_app.add_middleware(RequestSizeLimitMiddleware)
     # Additional middleware can be added here if needed
     # Example: fastapi_app.add_middleware(SomeOtherMiddleware)
\ No newline at end of file
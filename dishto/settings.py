@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+from django.core.exceptions import ImproperlyConfigured
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "rest_framework",
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',    
@@ -160,10 +162,55 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media storage backend: "local" (MEDIA_ROOT) or "s3" for any S3-compatible store
+# (AWS S3, or MinIO from docker-compose-dev.yml locally)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+if STORAGE_BACKEND == "s3":
+    DEFAULT_STORAGE = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": os.getenv("S3_BUCKET_NAME", "dishto-media"),
+            "endpoint_url": os.getenv("S3_ENDPOINT_URL") or None,  # unset for AWS
+            "access_key": os.getenv("S3_ACCESS_KEY_ID"),
+            "secret_key": os.getenv("S3_SECRET_ACCESS_KEY"),
+            "region_name": os.getenv("S3_REGION_NAME") or None,
+            "custom_domain": os.getenv("S3_CUSTOM_DOMAIN") or None,  # CDN or public host in front of the bucket
+            "addressing_style": os.getenv("S3_ADDRESSING_STYLE", "path"),  # MinIO needs path-style
+            # Public-read media gets plain, cacheable URLs; set true for a private bucket
+            "querystring_auth": os.getenv("S3_QUERYSTRING_AUTH", "false").lower() == "true",
+            # Same as local storage: never overwrite, give clashing names a suffix
+            "file_overwrite": False,
+        },
+    }
+elif STORAGE_BACKEND == "local":
+    DEFAULT_STORAGE = {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+else:
+    raise ImproperlyConfigured(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'; expected 'local' or 's3'.")
+STORAGES = {
+    "default": DEFAULT_STORAGE,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+# Threads for blocking storage calls from async code (see core/utils/storage.py)
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", 8))
+# Threads decoding/encoding images in API processes (core/utils/images.py); each
+# may hold a decoded source of up to 40MP, so keep this small
+IMAGE_INGEST_WORKERS = int(os.getenv("IMAGE_INGEST_WORKERS", 2))
+# Direct uploads (Menu UploadSession, S3 backend only): endpoint browsers use for the
+# pre-signed URLs when it differs from S3_ENDPOINT_URL, e.g. http://localhost:59000 for MinIO.
+# The bucket needs a lifecycle rule expiring the uploads/ prefix after a day (minio_init in
+# docker-compose-dev.yml adds one; on AWS add it to the bucket), which removes the raw objects
+# of abandoned or failed sessions.
+S3_PUBLIC_ENDPOINT_URL = os.getenv("S3_PUBLIC_ENDPOINT_URL") or None
+UPLOAD_SESSION_EXPIRY_SECONDS = int(os.getenv("UPLOAD_SESSION_EXPIRY_SECONDS", 900))
+
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 FILE_UPLOAD_PERMISSIONS = 0o644
+# FastAPI uploads: per image, and per request (checked while the body streams in,
+# so it has to fit the cover plus all slider images of a new outlet)
+MAX_IMAGE_UPLOAD_SIZE = int(os.getenv("MAX_IMAGE_UPLOAD_SIZE", 5 * 1024 * 1024))
+MAX_REQUEST_BODY_SIZE = int(os.getenv("MAX_REQUEST_BODY_SIZE", 25 * 1024 * 1024))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -173,4 +220,95 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Celery settings for local/manual worker
 CELERY_BROKER_URL = f"redis://{os.getenv('REDIS_HOST')}:{os.getenv('REDIS_PORT')}/0"
-CELERY_RESULT_BACKEND = f"redis://{os.getenv('REDIS_HOST')}:{os.getenv('REDIS_PORT')}/0"
\ No newline at end of file
+CELERY_RESULT_BACKEND = f"redis://{os.getenv('REDIS_HOST')}:{os.getenv('REDIS_PORT')}/0"
+# Each queue has its own worker (see docker-compose.yml) so a slow image generation
+# never holds up embedding work. Patterns are matched against task names.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "Menu.tasks.flush_menu_index_task": {"queue": "embeddings"},
+    "*.tasks.*image*": {"queue": "images"},
+    "Analysis.tasks.*": {"queue": "analytics"},
+}
+# Overridden per worker with --prefetch-multiplier; 1 suits long-running tasks
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_WORKER_PREFETCH_MULTIPLIER", 1))
+# Long tasks are acknowledged once done, so a restarted worker does not lose them
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+
+# Redis cache used for public menu snapshots and content version counters
+CACHE_REDIS_URL = os.getenv(
+    "CACHE_REDIS_URL",
+    f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/1",
+)
+MENU_SNAPSHOT_TTL = int(os.getenv("MENU_SNAPSHOT_TTL", 60 * 60 * 24))  # 1 day
+# Idle content version counters expire; scopes come from public URL slugs, so
+# unknown ones must not pile up. Bumps and reads refresh the TTL.
+CONTENT_VERSION_TTL = int(os.getenv("CONTENT_VERSION_TTL", 60 * 60 * 24))  # 1 day
+
+# Freshness for public (/open) responses; clients and CDNs revalidate with ETags
+OPEN_API_CACHE_MAX_AGE = int(os.getenv("OPEN_API_CACHE_MAX_AGE", 30))
+OPEN_API_STALE_WHILE_REVALIDATE = int(os.getenv("OPEN_API_STALE_WHILE_REVALIDATE", 300))
+
+# In-process franchise cache used by FranchiseMiddleware
+FRANCHISE_CACHE_MAXSIZE = int(os.getenv("FRANCHISE_CACHE_MAXSIZE", 1024))
+FRANCHISE_CACHE_TTL = int(os.getenv("FRANCHISE_CACHE_TTL", 300))
+FRANCHISE_NEGATIVE_CACHE_TTL = int(os.getenv("FRANCHISE_NEGATIVE_CACHE_TTL", 60))
+
+# Authenticated user snapshots used by AuthMiddleware
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", 4096))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))
+# Embed role/slug claims in issued tokens so permission checks skip the user lookup.
+# Role changes then take effect for a user's existing sessions only after they log in again.
+AUTH_EMBED_TOKEN_CLAIMS = os.getenv("AUTH_EMBED_TOKEN_CLAIMS", "false").lower() == "true"
+
+# Per-outlet authorization context (outlet, admin, enabled features) used by is_outlet_admin/require_feature
+OUTLET_AUTH_CACHE_MAXSIZE = int(os.getenv("OUTLET_AUTH_CACHE_MAXSIZE", 4096))
+OUTLET_AUTH_CACHE_TTL = int(os.getenv("OUTLET_AUTH_CACHE_TTL", 60))
+OUTLET_AUTH_NEGATIVE_CACHE_TTL = int(os.getenv("OUTLET_AUTH_NEGATIVE_CACHE_TTL", 10))
+
+# External AI/vector services
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", 30))  # seconds
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", 10))  # seconds
+
+# Contextual search query embeddings
+QUERY_EMBEDDING_CACHE_MAXSIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_MAXSIZE", 2048))
+QUERY_EMBEDDING_CACHE_TTL = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL", 60 * 60))  # 1 hour
+QUERY_EMBEDDING_REDIS_TTL = int(os.getenv("QUERY_EMBEDDING_REDIS_TTL", 60 * 60 * 24 * 7))  # 1 week
+
+# Menu item embedding indexer: saves within this window are embedded together
+MENU_INDEX_DEBOUNCE_SECONDS = int(os.getenv("MENU_INDEX_DEBOUNCE_SECONDS", 5))
+
+# Minimum trigram word similarity for the typo-tolerant menu search fallback
+MENU_SEARCH_TRIGRAM_THRESHOLD = float(os.getenv("MENU_SEARCH_TRIGRAM_THRESHOLD", 0.3))
+
+# Hybrid menu search: candidates taken from each of the lexical and vector rankings before fusion
+MENU_HYBRID_SEARCH_CANDIDATES = int(os.getenv("MENU_HYBRID_SEARCH_CANDIDATES", 30))
+# Minimum cosine similarity of a description chunk for contextual search hits
+MENU_CONTEXTUAL_SEARCH_THRESHOLD = float(os.getenv("MENU_CONTEXTUAL_SEARCH_THRESHOLD", 0.7))
+
+# Embedding backend for menu indexing and contextual search: "gemini" or "hashing"
+# (deterministic and offline, for tests and load tests). Changing the provider or
+# dimensions requires recreating the Qdrant collection and reindexing.
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "gemini")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", 768))
+
+# Menu item collection layout, applied when a collection is created (see reindex_menu_items)
+QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M", 16))
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", 100))
+QDRANT_HNSW_PAYLOAD_M = int(os.getenv("QDRANT_HNSW_PAYLOAD_M", 16))  # per-outlet graph links
+# Full-precision originals are only read for rescoring, so they stay on disk by default
+QDRANT_VECTORS_ON_DISK = os.getenv("QDRANT_VECTORS_ON_DISK", "true").lower() == "true"
+# Query-time search parameters
+QDRANT_SEARCH_HNSW_EF = int(os.getenv("QDRANT_SEARCH_HNSW_EF", 128))
+QDRANT_QUANTIZATION_OVERSAMPLING = float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", 2.0))
+
+# Bulk AI description enhancement: items per Gemini prompt and prompts in flight per job
+MENU_BULK_ENHANCE_BATCH_SIZE = int(os.getenv("MENU_BULK_ENHANCE_BATCH_SIZE", 10))
+MENU_BULK_ENHANCE_CONCURRENCY = int(os.getenv("MENU_BULK_ENHANCE_CONCURRENCY", 4))
+
+# A pending or running AI job not updated for this long is treated as lost
+# (broker restart, worker killed) and no longer blocks new jobs for its target
+AI_JOB_STALE_SECONDS = int(os.getenv("AI_JOB_STALE_SECONDS", 30 * 60))
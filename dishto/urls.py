@@ -17,8 +17,9 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path
-from fastapi import APIRouter
-from .views import root, healthcheck
+from fastapi import APIRouter, Depends
+from .views import root, healthcheck, cache_stats
+from core.dependencies import is_superadmin
 from Menu.views import router as menu_router
 from core.views import end_user_router, restaurant_router, feature_router # Added feature_router
 from Inventory.views import inventory_router
@@ -45,6 +46,9 @@ base_router_protected = APIRouter(prefix="/protected")
 base_router_protected.add_api_route(
     "/healthcheck", healthcheck, methods=["GET"], name="healthcheck"
 )
+base_router_protected.add_api_route(
+    "/cache-stats", cache_stats, methods=["GET"], name="cache_stats", dependencies=[Depends(is_superadmin)]
+)
 # restaurant urls
 base_router_protected.include_router(restaurant_router)
 # menu urls
@@ -1,6 +1,7 @@
 from fastapi.responses import JSONResponse
 from fastapi import status
 import core.utils.constants as constants
+from core.utils.cache import local_cache_stats
 
 def root() -> JSONResponse:
     """
@@ -22,4 +23,15 @@ def healthcheck() -> JSONResponse:
     """
     return JSONResponse(
         status_code=status.HTTP_200_OK, content={"message": constants.SUCCESS}
-    )
\ No newline at end of file
+    )
+
+def cache_stats() -> JSONResponse:
+    """
+    In-process cache counters of the worker that served the request.
+
+    Returns:
+        JSONResponse: Size, hit and miss counters per cache.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_200_OK, content={"message": constants.SUCCESS, "data": local_cache_stats()}
+    )